@@ -1,6 +1,14 @@
 from manim import *
+# Text outlines come from the on-disk cache in text_cache.py
+from text_cache import Text
+# self.wait() holds are encoded from a single rasterized frame
+from static_holds import StaticHoldMixin
+# Backdrops are rasterized once per play instead of on every frame
+from static_layers import StaticLayerMixin
+# SCENE_PROFILE=1 times every play/wait and writes a trace and flamegraph
+from render_profiler import RenderProfilerMixin
 
-class BitcoinTransactionScene(Scene):
+class BitcoinTransactionScene(RenderProfilerMixin, StaticHoldMixin, StaticLayerMixin, Scene):
     def construct(self):
         # Create a simple character (stick figure)
         character = self.create_character()
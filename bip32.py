@@ -0,0 +1,220 @@
+import hashlib
+import hmac
+from dataclasses import dataclass, replace
+from functools import lru_cache
+
+from secp256k1 import (
+    N, batch_to_affine, generator_multiple, jacobian_add_affine,
+    parse_point, point_add, point_mul, pubkey_from_private, serialize_point,
+)
+
+HARDENED = 0x80000000
+
+# Version bytes for mainnet extended keys
+XPRV_VERSION = bytes.fromhex("0488ade4")
+XPUB_VERSION = bytes.fromhex("0488b21e")
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def hash160(data):
+    return hashlib.new("ripemd160", hashlib.sha256(data).digest()).digest()
+
+
+def base58check_encode(payload):
+    data = payload + hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4]
+    value = int.from_bytes(data, "big")
+    encoded = ""
+    while value:
+        value, remainder = divmod(value, 58)
+        encoded = BASE58_ALPHABET[remainder] + encoded
+    leading_zeros = len(data) - len(data.lstrip(b"\0"))
+    return "1" * leading_zeros + encoded
+
+
+def base58check_decode(text):
+    value = 0
+    for char in text:
+        value = value * 58 + BASE58_ALPHABET.index(char)
+    leading_zeros = len(text) - len(text.lstrip("1"))
+    body = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    data = b"\0" * leading_zeros + body
+
+    payload, checksum = data[:-4], data[-4:]
+    if hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        raise ValueError("Invalid base58 checksum")
+    return payload
+
+
+def parse_path(path):
+    # "m/84'/0'/0'/0/5" -> (0x80000054, 0x80000000, 0x80000000, 0, 5)
+    if isinstance(path, tuple):
+        return path
+    parts = path.split("/")
+    if parts[0] != "m":
+        raise ValueError(f"Derivation path must start with 'm': {path!r}")
+
+    indices = []
+    for part in parts[1:]:
+        if part[-1:] in ("'", "h", "H"):
+            indices.append(int(part[:-1]) + HARDENED)
+        else:
+            indices.append(int(part))
+    return tuple(indices)
+
+
+def format_path(indices):
+    return "/".join(["m"] + [
+        f"{index - HARDENED}'" if index >= HARDENED else str(index)
+        for index in indices
+    ])
+
+
+@dataclass(frozen=True)
+class ExtendedKey:
+    # A BIP-32 node: private keys carry the scalar, public keys only the point
+    chain_code: bytes
+    public_key: bytes
+    private_key: int = None
+    depth: int = 0
+    parent_fingerprint: bytes = b"\0\0\0\0"
+    child_number: int = 0
+
+    @classmethod
+    def from_seed(cls, seed):
+        digest = hmac.new(b"Bitcoin seed", seed, hashlib.sha512).digest()
+        key = int.from_bytes(digest[:32], "big")
+        if not 0 < key < N:
+            raise ValueError("Seed produces an invalid master key")
+        return cls(
+            chain_code=digest[32:],
+            public_key=serialize_point(pubkey_from_private(key)),
+            private_key=key,
+        )
+
+    @property
+    def is_private(self):
+        return self.private_key is not None
+
+    @property
+    def identifier(self):
+        return hash160(self.public_key)
+
+    @property
+    def fingerprint(self):
+        return self.identifier[:4]
+
+    def neuter(self):
+        return replace(self, private_key=None)
+
+    def child(self, index):
+        # CKDpriv for private nodes, CKDpub for public ones
+        if index >= HARDENED:
+            if not self.is_private:
+                raise ValueError("Cannot derive a hardened child from a public key")
+            data = b"\0" + self.private_key.to_bytes(32, "big") + index.to_bytes(4, "big")
+        else:
+            data = self.public_key + index.to_bytes(4, "big")
+
+        digest = hmac.new(self.chain_code, data, hashlib.sha512).digest()
+        tweak = int.from_bytes(digest[:32], "big")
+        if tweak >= N:
+            raise ValueError(f"Invalid child key at index {index}, use the next index")
+
+        if self.is_private:
+            child_key = (tweak + self.private_key) % N
+            if child_key == 0:
+                raise ValueError(f"Invalid child key at index {index}, use the next index")
+            child_point = pubkey_from_private(child_key)
+        else:
+            child_key = None
+            child_point = point_add(point_mul(tweak), parse_point(self.public_key))
+            if child_point is None:
+                raise ValueError(f"Invalid child key at index {index}, use the next index")
+
+        return ExtendedKey(
+            chain_code=digest[32:],
+            public_key=serialize_point(child_point),
+            private_key=child_key,
+            depth=self.depth + 1,
+            parent_fingerprint=self.fingerprint,
+            child_number=index,
+        )
+
+    def public_children(self, start, count):
+        # Compressed public keys of the non-hardened children start..start+count-1.
+        # Works for public and private nodes alike, and converts the whole batch
+        # of Jacobian points to affine with a single inversion.
+        parent_point = parse_point(self.public_key)
+        points = []
+        for index in range(start, start + count):
+            data = self.public_key + index.to_bytes(4, "big")
+            tweak = int.from_bytes(hmac.new(self.chain_code, data, hashlib.sha512).digest()[:32], "big")
+            if tweak >= N:
+                raise ValueError(f"Invalid child key at index {index}, use the next index")
+            points.append(jacobian_add_affine(generator_multiple(tweak), parent_point))
+
+        affine_points = batch_to_affine(points)
+        if None in affine_points:
+            raise ValueError("Invalid child key in batch, derive it individually")
+        return [serialize_point(point) for point in affine_points]
+
+    def serialize(self):
+        # Base58Check xprv/xpub string
+        if self.is_private:
+            version, key_data = XPRV_VERSION, b"\0" + self.private_key.to_bytes(32, "big")
+        else:
+            version, key_data = XPUB_VERSION, self.public_key
+        return base58check_encode(
+            version
+            + bytes([self.depth])
+            + self.parent_fingerprint
+            + self.child_number.to_bytes(4, "big")
+            + self.chain_code
+            + key_data
+        )
+
+    @classmethod
+    def deserialize(cls, text):
+        data = base58check_decode(text)
+        if len(data) != 78:
+            raise ValueError("Extended keys are 78 bytes long")
+        version, key_data = data[:4], data[45:]
+
+        fields = dict(
+            chain_code=data[13:45],
+            depth=data[4],
+            parent_fingerprint=data[5:9],
+            child_number=int.from_bytes(data[9:13], "big"),
+        )
+        if version == XPRV_VERSION:
+            key = int.from_bytes(key_data[1:], "big")
+            return cls(public_key=serialize_point(pubkey_from_private(key)), private_key=key, **fields)
+        if version == XPUB_VERSION:
+            parse_point(key_data)
+            return cls(public_key=key_data, **fields)
+        raise ValueError(f"Unknown extended key version {version.hex()}")
+
+
+class Keychain:
+    # Derives nodes by path from one root key. Every intermediate node goes
+    # through an LRU cache keyed by its path, so m/84'/0'/0'/0/i for thousands
+    # of i walks from the cached m/84'/0'/0'/0 node instead of from the master.
+    def __init__(self, root, cache_size=4096):
+        self.root = root
+        self._node = lru_cache(maxsize=cache_size)(self._derive_node)
+
+    @classmethod
+    def from_seed(cls, seed, cache_size=4096):
+        return cls(ExtendedKey.from_seed(seed), cache_size)
+
+    def _derive_node(self, path):
+        if not path:
+            return self.root
+        return self._node(path[:-1]).child(path[-1])
+
+    def derive(self, path):
+        return self._node(parse_path(path))
+
+    def cache_info(self):
+        return self._node.cache_info()
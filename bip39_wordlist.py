@@ -0,0 +1,66 @@
+import os
+import numpy as np
+
+# The official BIP-39 English wordlist (2048 words, sorted, unique by first 4 letters)
+WORDLIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordlists", "english.txt")
+
+WORDLIST_SIZE = 2048
+BITS_PER_WORD = 11
+PREFIX_LENGTH = 4
+
+
+def _load_wordlist(path=WORDLIST_PATH):
+    # Read the wordlist once and make sure it is the real 2048-word list
+    with open(path, encoding="utf-8") as f:
+        words = tuple(line.strip() for line in f if line.strip())
+
+    if len(words) != WORDLIST_SIZE:
+        raise ValueError(f"Expected {WORDLIST_SIZE} words in {path}, found {len(words)}")
+
+    return words
+
+
+# Loaded once at import time - every lookup below is a table access
+WORDS = _load_wordlist()
+
+# Packed fixed-width array for vectorized index -> word mapping
+WORD_ARRAY = np.array(WORDS, dtype=f"U{max(len(word) for word in WORDS)}")
+
+# Reverse lookup tables: full word -> index and 4-letter prefix -> index
+WORD_INDEX = {word: index for index, word in enumerate(WORDS)}
+PREFIX_INDEX = {word[:PREFIX_LENGTH]: index for index, word in enumerate(WORDS)}
+
+if len(PREFIX_INDEX) != WORDLIST_SIZE:
+    raise ValueError("BIP-39 words must be unique in their first 4 letters")
+
+
+def word_at(index):
+    # Map a single 11-bit index to its word
+    return WORDS[index]
+
+
+def index_of(word):
+    # Map a word back to its 11-bit index, accepting abbreviations of 4+ letters
+    index = WORD_INDEX.get(word)
+    if index is None:
+        index = PREFIX_INDEX.get(word[:PREFIX_LENGTH])
+        if index is None or not WORDS[index].startswith(word):
+            raise KeyError(f"{word!r} is not a BIP-39 word")
+    return index
+
+
+def is_valid_word(word):
+    return word in WORD_INDEX
+
+
+def words_for_indices(indices):
+    # Map a whole batch (any shape) of 11-bit indices to words in one call
+    indices = np.asarray(indices)
+    if indices.size and (indices.min() < 0 or indices.max() >= WORDLIST_SIZE):
+        raise ValueError("Word indices must be in the range 0..2047")
+    return WORD_ARRAY[indices]
+
+
+def indices_for_words(words):
+    # Map a sequence of words back to an array of 11-bit indices
+    return np.fromiter((index_of(word) for word in words), dtype=np.uint16, count=len(words))
@@ -0,0 +1,112 @@
+class BitBuffer:
+    # A read-only run of bits packed into bytes (MSB first). Slicing returns a
+    # view that shares the underlying memoryview, so nothing is copied until the
+    # bits are turned into an int or a display string.
+    __slots__ = ("_data", "_offset", "_length")
+
+    def __init__(self, data, offset=0, length=None):
+        self._data = data if isinstance(data, memoryview) else memoryview(bytes(data))
+        total = len(self._data) * 8
+        if length is None:
+            length = total - offset
+        if offset < 0 or length < 0 or offset + length > total:
+            raise ValueError("Bit range lies outside the underlying buffer")
+        self._offset = offset
+        self._length = length
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(data)
+
+    @classmethod
+    def from_int(cls, value, length):
+        # Right-align the value in whole bytes and point the view at the low bits
+        if value < 0 or value >> length:
+            raise ValueError(f"{value} does not fit in {length} bits")
+        nbytes = (length + 7) // 8
+        return cls(value.to_bytes(nbytes, "big"), nbytes * 8 - length, length)
+
+    @classmethod
+    def from_bitstring(cls, bits):
+        return cls.from_int(int(bits, 2) if bits else 0, len(bits))
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                raise ValueError("BitBuffer slices must be contiguous")
+            return BitBuffer(self._data, self._offset + start, max(stop - start, 0))
+
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("BitBuffer index out of range")
+        position = self._offset + key
+        return (self._data[position >> 3] >> (7 - (position & 7))) & 1
+
+    def __iter__(self):
+        value = self.to_int()
+        for shift in range(self._length - 1, -1, -1):
+            yield (value >> shift) & 1
+
+    def to_int(self):
+        # Only the bytes that cover this view are read, then shifted and masked
+        if not self._length:
+            return 0
+        first = self._offset >> 3
+        last = (self._offset + self._length + 7) >> 3
+        value = int.from_bytes(self._data[first:last], "big")
+        value >>= (last << 3) - (self._offset + self._length)
+        return value & ((1 << self._length) - 1)
+
+    __int__ = to_int
+
+    def tobytes(self):
+        # Pack the view into fresh bytes, left-aligned (MSB first)
+        pad = -self._length % 8
+        return (self.to_int() << pad).to_bytes((self._length + pad) // 8, "big")
+
+    def windows(self, width):
+        # Integer values of consecutive width-bit windows (e.g. the 11-bit segments)
+        value = self.to_int()
+        count = self._length // width
+        mask = (1 << width) - 1
+        return [
+            (value >> (self._length - (i + 1) * width)) & mask
+            for i in range(count)
+        ]
+
+    def chunks(self, size):
+        # Views of consecutive size-bit rows; the last one may be shorter
+        return [self[start:start + size] for start in range(0, self._length, size)]
+
+    def rows(self, sizes):
+        # Views of rows with the given lengths, e.g. (26, 26, 26, 26, 24)
+        views = []
+        start = 0
+        for size in sizes:
+            views.append(self[start:start + size])
+            start += size
+        return views
+
+    def __add__(self, other):
+        if not isinstance(other, BitBuffer):
+            return NotImplemented
+        return BitBuffer.from_int((self.to_int() << len(other)) | other.to_int(), self._length + len(other))
+
+    def __eq__(self, other):
+        if not isinstance(other, BitBuffer):
+            return NotImplemented
+        return self._length == other._length and self.to_int() == other.to_int()
+
+    def __hash__(self):
+        return hash((self._length, self.to_int()))
+
+    def __str__(self):
+        return format(self.to_int(), f"0{self._length}b") if self._length else ""
+
+    def __repr__(self):
+        return f"BitBuffer('{self}')"
@@ -0,0 +1,44 @@
+from manim import *
+from text_cache import Text
+
+
+class BitRow(VGroup):
+    # A row of "0"/"1" characters built from cached glyphs. Each (font, size,
+    # weight) is laid out by Pango exactly once; every row after that is just
+    # copies of the two glyph outlines placed on a fixed grid. row[j] is the
+    # j-th bit, the same as indexing into a Text row.
+    _glyph_cache = {}
+
+    def __init__(self, bits, font_size=DEFAULT_FONT_SIZE, color=WHITE, font="", weight=NORMAL, **kwargs):
+        super().__init__(**kwargs)
+        glyphs, advance = self.get_glyphs(font_size, font, weight)
+
+        for j, bit in enumerate(str(bits)):
+            if bit not in glyphs:
+                raise ValueError(f"BitRow only renders 0 and 1, got {bit!r}")
+            glyph = glyphs[bit].copy()
+            glyph.shift(RIGHT * advance * j)
+            self.add(glyph)
+
+        self.set_color(color)
+        self.move_to(ORIGIN)
+
+    @classmethod
+    def get_glyphs(cls, font_size=DEFAULT_FONT_SIZE, font="", weight=NORMAL):
+        # Lay out "01" and "00" once per style: the first gives both glyphs on a
+        # shared baseline, the second gives the horizontal advance of a digit
+        key = (font, font_size, weight)
+        if key not in cls._glyph_cache:
+            pair = Text("01", font_size=font_size, font=font, weight=weight)
+            spacing = Text("00", font_size=font_size, font=font, weight=weight)
+            advance = spacing[1].get_center()[0] - spacing[0].get_center()[0]
+
+            # Centre each glyph horizontally on x=0, keep its vertical offset
+            baseline_shift = pair.get_center()[1]
+            glyphs = {}
+            for bit, glyph in zip("01", pair):
+                glyph = glyph.copy()
+                glyph.shift(LEFT * glyph.get_center()[0] + DOWN * baseline_shift)
+                glyphs[bit] = glyph
+            cls._glyph_cache[key] = (glyphs, advance)
+        return cls._glyph_cache[key]
@@ -1,8 +1,97 @@
 from manim import *
+# Text/MathTex outlines come from the on-disk cache in text_cache.py
+from text_cache import Text, MathTex
+# self.wait() holds are encoded from a single rasterized frame
+from static_holds import StaticHoldMixin
+# Backdrops are rasterized once per play instead of on every frame
+from static_layers import StaticLayerMixin
+# SCENE_PROFILE=1 times every play/wait and writes a trace and flamegraph
+from render_profiler import RenderProfilerMixin
+# Unchanged sections are spliced from earlier renders
+from section_cache import SectionCacheMixin, cached_section
 import numpy as np
+import functools
+# Epoch timespans and difficulties come from the header history
+from retarget import BLOCKS_PER_EPOCH, TARGET_TIMESPAN, compute_retargets, header_history
+# Targets are placed on a log2 hash-space axis
+from compact_target import LogTargetAxis, bits_to_log2_target
+# The mining grid shows simulated block arrivals
+from retarget_simulation import grid_scenario
+# Bitcoin's retarget compared with per-block algorithms
+from difficulty_algorithms import Asert, BitcoinEpoch, Lwma, block_hashrate_shock, compare_algorithms
 
-class BitcoinDifficultyAdjustment(Scene):
+
+# Difficulty rises when blocks came faster than expected, and falls when slower
+DIFFICULTY_FORMULA_TEX = r"\text{New Difficulty} = \text{Old Difficulty} \times \frac{\text{Expected Time}}{\text{Actual Time}}"
+
+
+@functools.lru_cache
+def difficulty_epochs():
+    # Every adjustment in assets/block_headers.npz (or the synthetic history)
+    return compute_retargets(*header_history())
+
+
+def format_difficulty(difficulty):
+    for scale, suffix in ((1e12, "T"), (1e9, "G"), (1e6, "M"), (1e3, "k")):
+        if difficulty >= scale:
+            return rf"{difficulty / scale:.2f}\text{{{suffix}}}"
+    return f"{difficulty:.2f}"
+
+
+def adjustment_tex(epoch):
+    # The three lines of the retarget calculation for one real epoch
+    minutes = epoch["clamped_timespan"] / 60
+    return (
+        DIFFICULTY_FORMULA_TEX.replace("=", "&=", 1) + r"\\",
+        rf"&= {format_difficulty(epoch['old_difficulty'])} \times "
+        rf"\frac{{{TARGET_TIMESPAN // 60:,} \text{{ min}}}}{{{minutes:,.0f} \text{{ min}}}}\\",
+        rf"&= {format_difficulty(epoch['old_difficulty'])} \times {epoch['adjustment']:.2f}"
+        rf" = {format_difficulty(epoch['new_difficulty'])}",
+    )
+
+
+@functools.lru_cache
+def mining_scenario(difficulty_ratio):
+    # Grid slots with a block and the epoch length, at difficulty/hashrate
+    return grid_scenario(difficulty_ratio)
+
+
+# Half the hashrate leaves halfway through the second epoch
+SHOCK_BLOCK = 3 * BLOCKS_PER_EPOCH // 2
+SHOCK_FACTOR = 0.5
+
+
+@functools.lru_cache
+def algorithm_comparison():
+    # The same shock and block draws replayed through each algorithm
+    hashrate = block_hashrate_shock(6 * BLOCKS_PER_EPOCH, SHOCK_BLOCK, SHOCK_FACTOR)
+    return compare_algorithms([BitcoinEpoch(), Asert(), Lwma()], hashrate)
+
+
+def format_weeks(weeks):
+    return f"{weeks:.1f} week" + ("" if round(weeks, 1) == 1 else "s")
+
+
+def epoch_label(epoch):
+    days = epoch["actual_timespan"] / 86400
+    return f"Blocks {epoch['start_height']:,}–{epoch['end_height']:,}: {days:.1f} days instead of {TARGET_TIMESPAN // 86400}"
+
+
+class BitcoinDifficultyAdjustment(RenderProfilerMixin, StaticHoldMixin, StaticLayerMixin, SectionCacheMixin, Scene):
     def construct(self):
+        # Each major block is its own cached section
+        self.scene1_introduction()
+        self.scene2_adjustment_formula()
+        self.scene3_fast_blocks()
+        self.scene4_slow_blocks()
+        self.scene5_hash_target()
+        self.scene6_summary()
+        self.scene7_mining_simulation()
+        self.scene8_algorithm_comparison()
+        self.scene9_conclusion()
+
+    @cached_section()
+    def scene1_introduction(self):
         # Title and introduction
         title = Text("Bitcoin Difficulty Adjustment", font_size=48)
         subtitle = Text("How Bitcoin maintains a 10-minute block time", font_size=32)
@@ -60,6 +149,8 @@ class BitcoinDifficultyAdjustment(Scene):
             FadeOut(mining_title)
         )
         
+    @cached_section()
+    def scene2_adjustment_formula(self):
         # Explain difficulty adjustment
         adjustment_title = Text("Difficulty Adjustment", font_size=40)
         self.play(Write(adjustment_title))
@@ -73,7 +164,7 @@ class BitcoinDifficultyAdjustment(Scene):
         self.wait(2)
         
         # Create a formula for difficulty adjustment
-        formula = MathTex(r"\text{New Difficulty} = \text{Old Difficulty} \times \frac{\text{Actual Time}}{\text{Expected Time}}")
+        formula = MathTex(DIFFICULTY_FORMULA_TEX)
         formula.next_to(period_text, DOWN, buff=1)
         self.play(Write(formula))
         self.wait(2)
@@ -91,25 +182,40 @@ class BitcoinDifficultyAdjustment(Scene):
             FadeOut(period_text)
         )
         
+        # Stays on screen through both scenarios
+        self.adjustment_title = adjustment_title
+
+    @cached_section("adjustment_title")
+    def scene3_fast_blocks(self):
+        adjustment_title = self.adjustment_title
+
         # Scenario 1: Blocks are being mined too quickly
         scenario1 = Text("Scenario 1: Blocks are mined too quickly", font_size=35, color=RED)
         scenario1.next_to(adjustment_title, DOWN, buff=0.5)
         self.play(Write(scenario1))
+
+        # The history's largest difficulty increase
+        epochs = difficulty_epochs()
+        epoch = epochs.epoch(epochs.most_extreme(increase=True))
+        fast_epoch = Text(epoch_label(epoch), font_size=22, color=RED)
+        fast_epoch.next_to(scenario1, DOWN, buff=0.2)
+        self.play(FadeIn(fast_epoch))
         
         # Create fast blocks
         fast_blocks = VGroup(*[Rectangle(height=1, width=2, fill_opacity=0.7, fill_color=RED) 
                              for _ in range(6)])
         fast_blocks.arrange(RIGHT, buff=0.3)
-        fast_blocks.next_to(scenario1, DOWN, buff=1)
+        fast_blocks.next_to(fast_epoch, DOWN, buff=0.8)
         
         # Add timestamps to fast blocks
         fast_timestamps = VGroup()
         base_time = 0
         
-        # Blocks with 5-minute intervals (too fast)
+        # Blocks at the epoch's average interval (too fast)
+        interval = epoch["actual_timespan"] / (BLOCKS_PER_EPOCH - 1) / 60
         for i in range(6):
-            base_time += 5
-            time_text = Text(f"{base_time} min", font_size=20)
+            base_time += interval
+            time_text = Text(f"{base_time:.0f} min", font_size=20)
             time_text.next_to(fast_blocks[i], DOWN)
             fast_timestamps.add(time_text)
         
@@ -122,11 +228,7 @@ class BitcoinDifficultyAdjustment(Scene):
             )
         
         # Show the adjustment calculation
-        fast_calc = MathTex(
-            r"\text{New Difficulty} &= \text{Old Difficulty} \times \frac{\text{Actual Time}}{\text{Expected Time}}\\",
-            r"&= \text{Old Difficulty} \times \frac{10,080 \text{ min}}{20,160 \text{ min}}\\",
-            r"&= \text{Old Difficulty} \times 0.5"
-        )
+        fast_calc = MathTex(*adjustment_tex(epoch))
         fast_calc.scale(0.4)  # Make it smaller to fit on screen
         fast_calc.next_to(fast_blocks, DOWN, buff=1)
         self.play(Write(fast_calc))
@@ -144,28 +246,41 @@ class BitcoinDifficultyAdjustment(Scene):
             FadeOut(fast_timestamps),
             FadeOut(fast_calc),
             FadeOut(fast_result),
+            FadeOut(fast_epoch),
             FadeOut(scenario1)
         )
         
+    @cached_section("adjustment_title")
+    def scene4_slow_blocks(self):
+        adjustment_title = self.adjustment_title
+
         # Scenario 2: Blocks are being mined too slowly
         scenario2 = Text("Scenario 2: Blocks are mined too slowly", font_size=35, color=BLUE)
         scenario2.next_to(adjustment_title, DOWN, buff=0.5)
         self.play(Write(scenario2))
+
+        # The history's largest difficulty decrease
+        epochs = difficulty_epochs()
+        epoch = epochs.epoch(epochs.most_extreme(increase=False))
+        slow_epoch = Text(epoch_label(epoch), font_size=22, color=BLUE)
+        slow_epoch.next_to(scenario2, DOWN, buff=0.2)
+        self.play(FadeIn(slow_epoch))
         
         # Create slow blocks
         slow_blocks = VGroup(*[Rectangle(height=1, width=2, fill_opacity=0.7, fill_color=BLUE) 
                              for _ in range(6)])
         slow_blocks.arrange(RIGHT, buff=0.3)
-        slow_blocks.next_to(scenario2, DOWN, buff=1)
+        slow_blocks.next_to(slow_epoch, DOWN, buff=0.8)
         
         # Add timestamps to slow blocks
         slow_timestamps = VGroup()
         base_time = 0
         
-        # Blocks with 15-minute intervals (too slow)
+        # Blocks at the epoch's average interval (too slow)
+        interval = epoch["actual_timespan"] / (BLOCKS_PER_EPOCH - 1) / 60
         for i in range(6):
-            base_time += 15
-            time_text = Text(f"{base_time} min", font_size=20)
+            base_time += interval
+            time_text = Text(f"{base_time:.0f} min", font_size=20)
             time_text.next_to(slow_blocks[i], DOWN)
             slow_timestamps.add(time_text)
         
@@ -178,11 +293,7 @@ class BitcoinDifficultyAdjustment(Scene):
             )
         
         # Show the adjustment calculation
-        slow_calc = MathTex(
-            r"\text{New Difficulty} &= \text{Old Difficulty} \times \frac{\text{Actual Time}}{\text{Expected Time}}\\",
-            r"&= \text{Old Difficulty} \times \frac{30,240 \text{ min}}{20,160 \text{ min}}\\",
-            r"&= \text{Old Difficulty} \times 1.5"
-        )
+        slow_calc = MathTex(*adjustment_tex(epoch))
         slow_calc.scale(0.4)  # Make it smaller to fit on screen
         slow_calc.next_to(slow_blocks, DOWN, buff=1)
         self.play(Write(slow_calc))
@@ -200,10 +311,13 @@ class BitcoinDifficultyAdjustment(Scene):
             FadeOut(slow_timestamps),
             FadeOut(slow_calc),
             FadeOut(slow_result),
+            FadeOut(slow_epoch),
             FadeOut(scenario2),
             FadeOut(adjustment_title)
         )
         
+    @cached_section()
+    def scene5_hash_target(self):
         # Final explanation with hashrate visualization
         final_title = Text("How Difficulty Works with Hashrate", font_size=40)
         self.play(Write(final_title))
@@ -215,18 +329,36 @@ class BitcoinDifficultyAdjustment(Scene):
         target_explanation.next_to(final_title, DOWN, buff=0.5)
         self.play(Write(target_explanation))
         
-        # Create a number line representing the hash space
+        # Create a number line representing the hash space, log2 scale so
+        # real targets (about 2^176 to 2^224 on mainnet) all fit on it
+        epochs = difficulty_epochs()
+        axis = LogTargetAxis.covering(epochs.new_bits)
         hash_space = NumberLine(
-            x_range=[0, 1, 0.1],
+            x_range=axis.x_range,
             length=10,
-            include_numbers=True,
+            include_numbers=False,
             include_tip=True,
         )
+        hash_space.add(VGroup(*[
+            MathTex(f"2^{{{tick}}}", font_size=24).next_to(hash_space.number_to_point(tick), DOWN)
+            for tick in axis.ticks()
+        ]))
         hash_space.next_to(target_explanation, DOWN, buff=1)
         self.play(Create(hash_space))
-        
-        # Show the target on the number line
-        target_value = 0.3
+
+        # Every target the history retargeted to, as a faint tick
+        epoch_marks = VGroup(*[
+            Line(UP * 0.1, DOWN * 0.1, stroke_width=1, color=YELLOW, stroke_opacity=0.5)
+            .move_to(hash_space.number_to_point(position))
+            for position in bits_to_log2_target(epochs.new_bits)
+        ])
+        epoch_marks_label = Text(f"Targets of all {len(epochs)} epochs", font_size=16, color=YELLOW)
+        epoch_marks_label.next_to(hash_space, UP, buff=0.6).align_to(hash_space, LEFT)
+        self.play(FadeIn(epoch_marks), FadeIn(epoch_marks_label))
+        self.mark_static(epoch_marks)
+        
+        # Show the target on the number line: difficulty 1, the genesis target
+        target_value = axis.position(bits=epochs.old_bits[0])
         target_point = hash_space.number_to_point(target_value)
         target_dot = Dot(target_point, color=GREEN)
         target_label = Text("Target", font_size=20, color=GREEN)
@@ -255,7 +387,8 @@ class BitcoinDifficultyAdjustment(Scene):
         
         # Show difficulty adjustment
         # First, make the target smaller (higher difficulty)
-        new_target_value = 0.1
+        # The history's hardest target
+        new_target_value = axis.position(bits=epochs.new_bits[np.argmax(epochs.new_difficulty)])
         new_target_point = hash_space.number_to_point(new_target_value)
         new_target_dot = Dot(new_target_point, color=RED)
         new_target_label = Text("New Target\n(Higher Difficulty)", font_size=20, color=RED)
@@ -283,7 +416,8 @@ class BitcoinDifficultyAdjustment(Scene):
         self.wait(2)
         
         # Then, make the target larger (lower difficulty)
-        newer_target_value = 0.5
+        # The target after the history's largest difficulty drop
+        newer_target_value = axis.position(bits=epochs.new_bits[epochs.most_extreme(increase=False)])
         newer_target_point = hash_space.number_to_point(newer_target_value)
         newer_target_dot = Dot(newer_target_point, color=BLUE)
         newer_target_label = Text("New Target\n(Lower Difficulty)", font_size=20, color=BLUE)
@@ -316,6 +450,8 @@ class BitcoinDifficultyAdjustment(Scene):
             FadeOut(target_dot),
             FadeOut(target_label),
             FadeOut(hash_space),
+            FadeOut(epoch_marks),
+            FadeOut(epoch_marks_label),
             FadeOut(target_explanation),
             FadeOut(difficulty_text),
             FadeOut(higher_diff_text),
@@ -323,6 +459,8 @@ class BitcoinDifficultyAdjustment(Scene):
             FadeOut(final_title)
         )
         
+    @cached_section()
+    def scene6_summary(self):
         summary_title = Text("Bitcoin Difficulty Adjustment: Summary", font_size=40)
         self.play(Write(summary_title))
         self.wait(1)
@@ -357,6 +495,8 @@ class BitcoinDifficultyAdjustment(Scene):
             FadeOut(final_message)
         )
         
+    @cached_section()
+    def scene7_mining_simulation(self):
         # Add an improved mining simulation section
         mining_sim_title = Text("Mining Simulation: Finding Valid Blocks", font_size=40)
         self.play(Write(mining_sim_title))
@@ -378,14 +518,17 @@ class BitcoinDifficultyAdjustment(Scene):
                 hash_grid.add(square)
         
         self.play(Create(hash_grid))
+        self.mark_static(hash_grid)
         
         # Normal difficulty - show valid hashes
         normal_diff_text = Text("Normal Difficulty", font_size=28, color=YELLOW)
         normal_diff_text.to_edge(LEFT).shift(RIGHT * 2 + UP * 0.5)
         self.play(Write(normal_diff_text))
         
-        # Highlight valid hashes (below target) in green
-        valid_indices = [3, 11, 17, 25]  # Random indices for valid hashes
+        # Highlight valid hashes (below target) in green, where a simulated
+        # miner at the target difficulty found blocks
+        normal = mining_scenario(1.0)
+        valid_indices = normal.valid_indices
         for idx in valid_indices:
             self.play(
                 hash_grid[idx].animate.set_fill(GREEN, opacity=0.8),
@@ -393,12 +536,12 @@ class BitcoinDifficultyAdjustment(Scene):
             )
         
         # Add a simple explanation
-        valid_text = Text("4 valid blocks found", font_size=24, color=GREEN)
+        valid_text = Text(f"{len(valid_indices)} valid blocks found", font_size=24, color=GREEN)
         valid_text.next_to(hash_grid, DOWN, buff=0.5)
         self.play(Write(valid_text))
         
         # Add time indicator
-        time_text = Text("Time to mine 2016 blocks: 2 weeks (target)", font_size=24)
+        time_text = Text(f"Time to mine 2016 blocks: {format_weeks(normal.epoch_weeks)} (target)", font_size=24)
         time_text.next_to(valid_text, DOWN, buff=0.5)
         self.play(Write(time_text))
         self.wait(2)
@@ -416,8 +559,9 @@ class BitcoinDifficultyAdjustment(Scene):
         high_diff_text.to_edge(LEFT).shift(RIGHT * 2 + UP * 0.5)
         self.play(Write(high_diff_text))
         
-        # With higher difficulty, only 2 valid hashes
-        harder_valid_indices = [7, 22]
+        # With twice the difficulty, about half as many valid hashes
+        harder = mining_scenario(2.0)
+        harder_valid_indices = harder.valid_indices
         for idx in harder_valid_indices:
             self.play(
                 hash_grid[idx].animate.set_fill(GREEN, opacity=0.8),
@@ -425,17 +569,19 @@ class BitcoinDifficultyAdjustment(Scene):
             )
         
         # Add explanation for high difficulty
-        harder_valid_text = Text("Only 2 valid blocks found", font_size=24, color=RED)
+        harder_valid_text = Text(f"Only {len(harder_valid_indices)} valid blocks found", font_size=24, color=RED)
         harder_valid_text.next_to(hash_grid, DOWN, buff=0.5)
         self.play(Write(harder_valid_text))
         
         # Add time indicator for high difficulty
-        harder_time_text = Text("Time to mine 2016 blocks: 4 weeks (too slow)", font_size=24)
+        harder_time_text = Text(
+            f"Time to mine 2016 blocks: {format_weeks(harder.epoch_weeks)} (too slow)", font_size=24
+        )
         harder_time_text.next_to(harder_valid_text, DOWN, buff=0.5)
         self.play(Write(harder_time_text))
         
         # Add adjustment explanation
-        adjustment_text = Text("Result: Difficulty will DECREASE", font_size=28, color=BLUE)
+        adjustment_text = Text(f"Result: Difficulty will DECREASE (×{harder.adjustment:.2f})", font_size=28, color=BLUE)
         adjustment_text.next_to(harder_time_text, DOWN, buff=0.5)
         self.play(Write(adjustment_text))
         self.wait(2)
@@ -454,8 +600,9 @@ class BitcoinDifficultyAdjustment(Scene):
         low_diff_text.to_edge(LEFT).shift(RIGHT * 2 + UP * 0.5)
         self.play(Write(low_diff_text))
         
-        # With lower difficulty, more valid hashes
-        easier_valid_indices = [1, 5, 9, 13, 18, 22, 26, 30]
+        # With half the difficulty, about twice as many valid hashes
+        easier = mining_scenario(0.5)
+        easier_valid_indices = easier.valid_indices
         for idx in easier_valid_indices:
             self.play(
                 hash_grid[idx].animate.set_fill(GREEN, opacity=0.8),
@@ -463,17 +610,21 @@ class BitcoinDifficultyAdjustment(Scene):
             )
         
         # Add explanation for low difficulty
-        easier_valid_text = Text("8 valid blocks found (too many)", font_size=24, color=BLUE)
+        easier_valid_text = Text(f"{len(easier_valid_indices)} valid blocks found (too many)", font_size=24, color=BLUE)
         easier_valid_text.next_to(hash_grid, DOWN, buff=0.5)
         self.play(Write(easier_valid_text))
         
         # Add time indicator for low difficulty
-        easier_time_text = Text("Time to mine 2016 blocks: 1 week (too fast)", font_size=24)
+        easier_time_text = Text(
+            f"Time to mine 2016 blocks: {format_weeks(easier.epoch_weeks)} (too fast)", font_size=24
+        )
         easier_time_text.next_to(easier_valid_text, DOWN, buff=0.5)
         self.play(Write(easier_time_text))
         
         # Add adjustment explanation
-        easier_adjustment_text = Text("Result: Difficulty will INCREASE", font_size=28, color=RED)
+        easier_adjustment_text = Text(
+            f"Result: Difficulty will INCREASE (×{easier.adjustment:.2f})", font_size=28, color=RED
+        )
         easier_adjustment_text.next_to(easier_time_text, DOWN, buff=0.5)
         self.play(Write(easier_adjustment_text))
         self.wait(2)
@@ -506,6 +657,77 @@ class BitcoinDifficultyAdjustment(Scene):
             FadeOut(balance_text)
         )
         
+    @cached_section()
+    def scene8_algorithm_comparison(self):
+        comparison_title = Text("Other Ways to Adjust Difficulty", font_size=40)
+        self.play(Write(comparison_title))
+        self.wait(1)
+        self.play(comparison_title.animate.to_edge(UP))
+
+        shock_text = Text("Half the hashrate leaves in the middle of an epoch", font_size=26)
+        shock_text.next_to(comparison_title, DOWN, buff=0.4)
+        self.play(Write(shock_text))
+
+        # Median over all simulated trials of the average block time
+        runs = algorithm_comparison()
+        curves = [run.block_time_curve() for run in runs]
+        max_days = max(days[-1] for days, _ in curves)
+        axes = Axes(
+            x_range=[0, np.ceil(max_days / 14) * 14, 14],
+            y_range=[0, 25, 5],
+            x_length=10,
+            y_length=4,
+            axis_config={"include_numbers": True, "font_size": 20},
+            tips=False,
+        )
+        axes.next_to(shock_text, DOWN, buff=0.4)
+        axis_labels = axes.get_axis_labels(
+            x_label=Text("Days", font_size=20), y_label=Text("Block time (min)", font_size=20)
+        )
+        target_line = DashedVMobject(axes.plot(lambda x: 10, color=GRAY))
+        self.play(Create(axes), Write(axis_labels), Create(target_line))
+        self.mark_static(axes, target_line)
+
+        shock_day = np.median(runs[0].times[SHOCK_BLOCK]) / 86400
+        shock_line = axes.get_vertical_line(axes.c2p(shock_day, 25), color=RED)
+        shock_label = Text("Hashrate halves", font_size=18, color=RED)
+        shock_label.next_to(shock_line, UP, buff=0.1)
+        self.play(Create(shock_line), FadeIn(shock_label))
+
+        # One curve per algorithm, with its legend entry
+        legend = VGroup()
+        graphs = VGroup()
+        for run, (days, minutes), color in zip(runs, curves, (ORANGE, BLUE, GREEN)):
+            graph = axes.plot_line_graph(days, minutes, line_color=color, add_vertex_dots=False, stroke_width=3)
+            label = Text(run.name, font_size=22, color=color)
+            legend.add(label)
+            graphs.add(graph)
+        legend.arrange(RIGHT, buff=0.8)
+        legend.next_to(axes, DOWN, buff=0.4)
+        for graph, label in zip(graphs, legend):
+            self.play(Create(graph), FadeIn(label), run_time=2)
+        self.wait(1)
+
+        slowest = ", ".join(f"{run.name} {minutes.max():.0f} min" for run, (_, minutes) in zip(runs, curves))
+        slowest_text = Text(f"Slowest blocks after the shock: {slowest}", font_size=24, color=YELLOW)
+        slowest_text.move_to(shock_text)
+        self.play(Transform(shock_text, slowest_text))
+        self.wait(3)
+
+        self.play(
+            FadeOut(comparison_title),
+            FadeOut(shock_text),
+            FadeOut(axes),
+            FadeOut(axis_labels),
+            FadeOut(target_line),
+            FadeOut(shock_line),
+            FadeOut(shock_label),
+            FadeOut(graphs),
+            FadeOut(legend)
+        )
+
+    @cached_section()
+    def scene9_conclusion(self):
         # Final conclusion - simplified
         final_title = Text("Bitcoin's Difficulty Adjustment", font_size=48, color=YELLOW)
         self.play(Write(final_title))
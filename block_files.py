@@ -0,0 +1,473 @@
+import argparse
+import glob
+import hashlib
+import mmap
+import os
+import random
+import re
+import resource
+import struct
+import time
+
+import numpy as np
+
+# Network magic that frames every block in blk*.dat
+MAINNET_MAGIC = bytes.fromhex("f9beb4d9")
+HEADER_SIZE = 80
+HEADER_FORMAT = struct.Struct("<i32s32sIII")  # version, prev, merkle, time, bits, nonce
+NULL_HASH = bytes(32)
+
+# Bitcoin Core 28+ XORs everything it writes to blk*.dat with the 8-byte
+# key in blocks/xor.dat (all zero, or no file, when obfuscation is off)
+XOR_KEY_FILE = "xor.dat"
+
+# bitcoind starts a new blk file at 128 MiB and preallocates in 16 MiB chunks
+MAX_BLOCKFILE_SIZE = 128 * 1024 * 1024
+BLOCKFILE_CHUNK_SIZE = 16 * 1024 * 1024
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_DIR = os.path.join(REPO_DIR, ".cache", "block_index")
+
+# Pages behind the read position are handed back every this many bytes, so
+# streaming a multi-GB file doesn't grow the resident set
+RELEASE_EVERY = 64 * 1024 * 1024
+
+# Parent markers while linking blocks into a chain
+_GENESIS = -2
+_MISSING = -1
+
+
+def double_sha256(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part)
+    return hashlib.sha256(h.digest()).digest()
+
+
+def read_varint(buf, pos):
+    # CompactSize: (value, position after it)
+    first = buf[pos]
+    if first < 0xFD:
+        return first, pos + 1
+    width = {0xFD: 2, 0xFE: 4, 0xFF: 8}[first]
+    return int.from_bytes(buf[pos + 1:pos + 1 + width], "little"), pos + 1 + width
+
+
+def write_varint(n):
+    if n < 0xFD:
+        return bytes([n])
+    if n <= 0xFFFF:
+        return b"\xfd" + n.to_bytes(2, "little")
+    if n <= 0xFFFFFFFF:
+        return b"\xfe" + n.to_bytes(4, "little")
+    return b"\xff" + n.to_bytes(8, "little")
+
+
+def transaction_layout(buf, pos):
+    # (end, witness start or None) of the transaction serialized at `pos`
+    segwit = buf[pos + 4] == 0 and buf[pos + 5] == 1
+    cursor = pos + (6 if segwit else 4)
+    inputs, cursor = read_varint(buf, cursor)
+    for _ in range(inputs):
+        script, cursor = read_varint(buf, cursor + 36)  # prevout, script
+        cursor += script + 4  # sequence
+    outputs, cursor = read_varint(buf, cursor)
+    for _ in range(outputs):
+        script, cursor = read_varint(buf, cursor + 8)  # value, script
+        cursor += script
+    witness = None
+    if segwit:
+        witness = cursor
+        for _ in range(inputs):
+            items, cursor = read_varint(buf, cursor)
+            for _ in range(items):
+                size, cursor = read_varint(buf, cursor)
+                cursor += size
+    return cursor + 4, witness  # locktime
+
+
+def txid(tx):
+    # Hash of the serialization without marker, flag and witnesses
+    end, witness = transaction_layout(tx, 0)
+    if witness is None:
+        return double_sha256(tx[:end])
+    return double_sha256(tx[:4], tx[6:witness], tx[end - 4:end])
+
+
+def merkle_root(hashes):
+    level = list(hashes)
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [double_sha256(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+    return level[0]
+
+
+class BlockView:
+    # One framed block inside a mapped blk file. Nothing is copied: `data`
+    # is a memoryview slice of the map (a de-obfuscated copy for XORed
+    # files), and fields are decoded on access.
+    __slots__ = ("file", "offset", "data")
+
+    def __init__(self, file, offset, data):
+        self.file = file
+        self.offset = offset
+        self.data = data
+
+    @property
+    def header(self):
+        return self.data[:HEADER_SIZE]
+
+    def fields(self):
+        return HEADER_FORMAT.unpack_from(self.data)
+
+    @property
+    def prev_hash(self):
+        return bytes(self.data[4:36])
+
+    @property
+    def time(self):
+        return int.from_bytes(self.data[68:72], "little")
+
+    @property
+    def bits(self):
+        return int.from_bytes(self.data[72:76], "little")
+
+    @property
+    def hash(self):
+        # Internal byte order; reverse it for the usual hex display
+        return double_sha256(self.header)
+
+    @property
+    def tx_count(self):
+        return read_varint(self.data, HEADER_SIZE)[0]
+
+    def transactions(self):
+        # memoryview slice per transaction, parsed as the generator advances
+        count, pos = read_varint(self.data, HEADER_SIZE)
+        for _ in range(count):
+            end, _ = transaction_layout(self.data, pos)
+            yield self.data[pos:end]
+            pos = end
+
+    def verify_merkle_root(self):
+        return merkle_root(txid(tx) for tx in self.transactions()) == self.fields()[2]
+
+
+def read_xor_key(directory):
+    # The blocks directory's obfuscation key, or b"" if its files are plain
+    path = os.path.join(directory, XOR_KEY_FILE)
+    if not os.path.exists(path):
+        return b""
+    with open(path, "rb") as f:
+        key = f.read()
+    return key if any(key) else b""
+
+
+def apply_xor_key(data, key, offset):
+    # XOR with the key cycled from file position `offset` (obfuscation and
+    # de-obfuscation are the same operation). Returns a copy.
+    shift = offset % len(key)
+    stream = (key[shift:] + key[:shift]) * (len(data) // len(key) + 1)
+    return memoryview(np.frombuffer(data, dtype=np.uint8) ^ np.frombuffer(stream, dtype=np.uint8, count=len(data)))
+
+
+def _map(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mm, "madvise"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    return mm
+
+
+def _close(mm):
+    # Views handed out may still be alive; the map then closes with them
+    try:
+        mm.close()
+    except BufferError:
+        pass
+
+
+def iter_block_file(path, file=0, magic=MAINNET_MAGIC, start=0, xor_key=None):
+    # Walk magic/size framing. Stops at bitcoind's zero-filled preallocated
+    # tail or at a block that is still being written. xor_key=None reads the
+    # key from xor.dat next to the file. Blocks of obfuscated files are
+    # de-obfuscated copies rather than views of the map.
+    if xor_key is None:
+        xor_key = read_xor_key(os.path.dirname(path))
+    mm = _map(path)
+    if mm is None:
+        return
+    view = memoryview(mm)
+    released = start - start % mmap.PAGESIZE
+    try:
+        pos = start
+        while pos + 8 <= len(mm):
+            frame = apply_xor_key(view[pos:pos + 8], xor_key, pos) if xor_key else view[pos:pos + 8]
+            if frame[:4] != magic:
+                # The preallocated tail is never obfuscated
+                if not any(view[pos:pos + 4]):
+                    break
+                raise ValueError(f"{path}: bad magic {bytes(frame[:4]).hex()} at offset {pos}")
+            size = int.from_bytes(frame[4:8], "little")
+            if pos + 8 + size > len(mm):
+                break
+            data = view[pos + 8:pos + 8 + size]
+            yield BlockView(file, pos + 8, apply_xor_key(data, xor_key, pos + 8) if xor_key else data)
+            pos += 8 + size
+
+            if hasattr(mm, "madvise") and pos - released >= RELEASE_EVERY:
+                # Clean file-backed pages: a later access just reads them again
+                upto = pos - pos % mmap.PAGESIZE
+                mm.madvise(mmap.MADV_DONTNEED, released, upto - released)
+                released = upto
+    finally:
+        view.release()
+        _close(mm)
+
+
+def block_file_number(path):
+    match = re.search(r"blk(\d+)\.dat$", path)
+    return int(match.group(1)) if match else 0
+
+
+def block_file_paths(directory):
+    return sorted(glob.glob(os.path.join(directory, "blk*.dat")), key=block_file_number)
+
+
+class BlockFiles:
+    # A directory of blk*.dat files. Blocks are stored in arrival order,
+    # not height order; index() links them into the best chain and is kept
+    # on disk so later runs can seek straight to a height.
+    def __init__(self, directory, magic=MAINNET_MAGIC):
+        self.directory = directory
+        self.magic = magic
+        self.paths = {block_file_number(path): path for path in block_file_paths(directory)}
+        self.xor_key = read_xor_key(directory)
+        self._index = None
+        self._maps = {}
+
+    def blocks(self):
+        for number, path in self.paths.items():
+            yield from iter_block_file(path, number, self.magic, xor_key=self.xor_key)
+
+    def fingerprint(self):
+        h = hashlib.sha256(self.magic)
+        h.update(os.path.abspath(self.directory).encode())
+        for path in self.paths.values():
+            stat = os.stat(path)
+            h.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return h.hexdigest()
+
+    def index(self):
+        # Height-ordered arrays: blk_file, offset, size, time, bits, hash
+        if self._index is None:
+            path = os.path.join(INDEX_DIR, f"{self.fingerprint()}.npz")
+            if os.path.exists(path):
+                with np.load(path) as data:
+                    self._index = dict(data)
+            else:
+                self._index = self.build_index()
+                os.makedirs(INDEX_DIR, exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp.npz"
+                np.savez(tmp, **self._index)
+                os.replace(tmp, path)
+        return self._index
+
+    def build_index(self):
+        files, offsets, sizes, times, bits, hashes, prevs = [], [], [], [], [], [], []
+        for block in self.blocks():
+            files.append(block.file)
+            offsets.append(block.offset)
+            sizes.append(len(block.data))
+            _, prev, _, block_time, block_bits, _ = block.fields()
+            times.append(block_time)
+            bits.append(block_bits)
+            hashes.append(block.hash)
+            prevs.append(prev)
+
+        # Heights by following parents; blocks whose ancestry is missing
+        # from these files (pruned, or not yet downloaded) are left out
+        position = {block_hash: i for i, block_hash in enumerate(hashes)}
+        heights = [None] * len(hashes)
+        for i in range(len(hashes)):
+            path, j = [], i
+            while j >= 0 and heights[j] is None:
+                path.append(j)
+                j = _GENESIS if prevs[j] == NULL_HASH else position.get(prevs[j], _MISSING)
+            if j == _MISSING or (j >= 0 and heights[j] == _MISSING):
+                resolved = [_MISSING] * len(path)
+            else:
+                base = -1 if j == _GENESIS else heights[j]
+                resolved = range(base + len(path), base, -1)
+            for k, height in zip(path, resolved):
+                heights[k] = height
+
+        known = [i for i, height in enumerate(heights) if height != _MISSING]
+        if not known:
+            raise ValueError(f"No chain starting at a genesis block in {self.directory}")
+        # Best chain: back from the highest block (first seen wins a tie)
+        tip = max(known, key=lambda i: heights[i])
+        order = [0] * (heights[tip] + 1)
+        i = tip
+        while True:
+            order[heights[i]] = i
+            if prevs[i] == NULL_HASH:
+                break
+            i = position[prevs[i]]
+
+        def column(values, dtype):
+            return np.asarray(values, dtype=dtype)[order]
+
+        return {
+            "blk_file": column(files, np.int32),
+            "offset": column(offsets, np.int64),
+            "size": column(sizes, np.uint32),
+            "time": column(times, np.uint32),
+            "bits": column(bits, np.uint32),
+            "hash": column(hashes, "S32"),
+        }
+
+    def __len__(self):
+        return len(self.index()["offset"])
+
+    def block_at(self, height):
+        index = self.index()
+        file = int(index["blk_file"][height])
+        if file not in self._maps:
+            self._maps[file] = _map(self.paths[file])
+        offset, size = int(index["offset"][height]), int(index["size"][height])
+        data = memoryview(self._maps[file])[offset:offset + size]
+        return BlockView(file, offset, apply_xor_key(data, self.xor_key, offset) if self.xor_key else data)
+
+    def header_history(self):
+        # (timestamps, bits) by height, for retarget.compute_retargets
+        index = self.index()
+        return index["time"].astype(np.int64), index["bits"].copy()
+
+    def close(self):
+        for mm in self._maps.values():
+            _close(mm)
+        self._maps = {}
+
+
+#######################
+# Synthetic blk files
+#######################
+def _synthetic_transaction(rng, segwit):
+    inputs = rng.randint(1, 3)
+    outputs = rng.randint(1, 3)
+    body = [write_varint(inputs)]
+    for _ in range(inputs):
+        script = b"" if segwit else rng.randbytes(rng.randint(100, 107))
+        body += [rng.randbytes(36), write_varint(len(script)), script, b"\xff\xff\xff\xff"]
+    body.append(write_varint(outputs))
+    for _ in range(outputs):
+        body += [rng.getrandbits(40).to_bytes(8, "little"), b"\x16\x00\x14", rng.randbytes(20)]
+    body = b"".join(body)
+    version, locktime = (2).to_bytes(4, "little"), bytes(4)
+    txid = double_sha256(version, body, locktime)
+    if not segwit:
+        return version + body + locktime, txid
+    witness = b"".join(b"\x02\x48" + rng.randbytes(72) + b"\x21" + rng.randbytes(33) for _ in range(inputs))
+    return version + b"\x00\x01" + body + witness + locktime, txid
+
+
+def synthetic_blocks(num_blocks, txs_per_block=50, segwit_share=0.7, seed=0):
+    # Serialized blocks with linked hashes, correct merkle roots and the
+    # synthetic header history's times and nBits (the nonces are not mined)
+    from retarget import BLOCKS_PER_EPOCH, synthetic_header_history
+
+    rng = random.Random(seed)
+    timestamps, bits = synthetic_header_history(epochs=-(-num_blocks // BLOCKS_PER_EPOCH), seed=seed)
+    prev = NULL_HASH
+    for height in range(num_blocks):
+        txs, txids = [], []
+        for i in range(rng.randint(1, 2 * txs_per_block)):
+            tx, tx_hash = _synthetic_transaction(rng, segwit=i > 0 and rng.random() < segwit_share)
+            txs.append(tx)
+            txids.append(tx_hash)
+        header = HEADER_FORMAT.pack(0x20000000, prev, merkle_root(txids),
+                                    int(timestamps[height]), int(bits[height]), rng.getrandbits(32))
+        prev = double_sha256(header)
+        yield header + write_varint(len(txs)) + b"".join(txs)
+
+
+def write_synthetic_block_files(directory, num_blocks, txs_per_block=50, seed=0, reorder_window=4,
+                                max_file_size=MAX_BLOCKFILE_SIZE, magic=MAINNET_MAGIC, obfuscate=False):
+    # blk00000.dat, blk00001.dat, ... as bitcoind lays them out: blocks in
+    # slightly shuffled arrival order, zero-filled to the preallocation chunk,
+    # and with obfuscate=True XORed with a random key saved to xor.dat
+    rng = random.Random(seed + 1)
+    os.makedirs(directory, exist_ok=True)
+    xor_key = rng.randbytes(8) if obfuscate else bytes(8)
+    with open(os.path.join(directory, XOR_KEY_FILE), "wb") as f:
+        f.write(xor_key)
+    paths, pending, out = [], [], None
+
+    def write(block):
+        nonlocal out
+        if out is None or out.tell() + 8 + len(block) > max_file_size:
+            finish()
+            paths.append(os.path.join(directory, f"blk{len(paths):05d}.dat"))
+            out = open(paths[-1], "wb")
+        framed = magic + len(block).to_bytes(4, "little") + block
+        out.write(apply_xor_key(framed, xor_key, out.tell()) if obfuscate else framed)
+
+    def finish():
+        if out is not None:
+            size = out.tell()
+            out.write(bytes(-size % BLOCKFILE_CHUNK_SIZE))
+            out.close()
+
+    for block in synthetic_blocks(num_blocks, txs_per_block, seed=seed):
+        pending.append(block)
+        if len(pending) >= reorder_window:
+            write(pending.pop(rng.randrange(len(pending))))
+    while pending:
+        write(pending.pop(rng.randrange(len(pending))))
+    finish()
+    return paths
+
+
+if __name__ == "__main__":
+    # python block_files.py /tmp/blocks --generate 20000 --txs 200
+    # python block_files.py ~/.bitcoin/blocks --verify 100  (xor.dat is applied if present)
+    parser = argparse.ArgumentParser(description="Stream, verify and index blk*.dat files")
+    parser.add_argument("directory")
+    parser.add_argument("--generate", type=int, metavar="BLOCKS", help="write synthetic blk files first")
+    parser.add_argument("--txs", type=int, default=50, help="average transactions per synthetic block")
+    parser.add_argument("--file-size", type=int, default=MAX_BLOCKFILE_SIZE // 2**20,
+                        help="MiB per synthetic blk file (raise it to test one multi-GB file)")
+    parser.add_argument("--obfuscate", action="store_true", help="XOR the synthetic files like Bitcoin Core 28+")
+    parser.add_argument("--verify", type=int, default=0, metavar="N", help="check merkle roots of every Nth block")
+    args = parser.parse_args()
+
+    if args.generate:
+        start = time.perf_counter()
+        paths = write_synthetic_block_files(args.directory, args.generate, args.txs,
+                                            max_file_size=args.file_size * 2**20, obfuscate=args.obfuscate)
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"Wrote {len(paths)} files ({size / 1e9:.2f} GB) in {time.perf_counter() - start:.1f}s")
+
+    block_files = BlockFiles(args.directory)
+    start = time.perf_counter()
+    blocks = transactions = total = 0
+    for block in block_files.blocks():
+        blocks += 1
+        total += len(block.data)
+        transactions += block.tx_count
+        if args.verify and blocks % args.verify == 0 and not block.verify_merkle_root():
+            raise SystemExit(f"Merkle root mismatch in blk{block.file:05d}.dat at offset {block.offset}")
+    seconds = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Streamed {blocks} blocks, {transactions} transactions ({total / 1e9:.2f} GB) in {seconds:.1f}s "
+          f"({total / 1e6 / seconds:.0f} MB/s), peak RSS {peak_mb:.0f} MB")
+
+    start = time.perf_counter()
+    index = block_files.index()
+    print(f"Indexed {len(index['offset'])} heights in {time.perf_counter() - start:.2f}s")
+    tip = block_files.block_at(len(index["offset"]) - 1)
+    print(f"Tip {tip.hash[::-1].hex()} in blk{tip.file:05d}.dat at offset {tip.offset}")
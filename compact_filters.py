@@ -0,0 +1,358 @@
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+# BIP-158 basic filter parameters
+FILTER_P = 19
+FILTER_M = 784931
+
+_MASK64 = (1 << 64) - 1
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+#######################
+# SipHash-2-4
+#######################
+def _rotl(x, b):
+    return ((x << b) | (x >> (64 - b))) & _MASK64
+
+
+def siphash24(k0, k1, data):
+    # Reference scalar SipHash-2-4 with the key split into two 64-bit words
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    def sip_round():
+        nonlocal v0, v1, v2, v3
+        v0 = (v0 + v1) & _MASK64
+        v1 = _rotl(v1, 13) ^ v0
+        v0 = _rotl(v0, 32)
+        v2 = (v2 + v3) & _MASK64
+        v3 = _rotl(v3, 16) ^ v2
+        v0 = (v0 + v3) & _MASK64
+        v3 = _rotl(v3, 21) ^ v0
+        v2 = (v2 + v1) & _MASK64
+        v1 = _rotl(v1, 17) ^ v2
+        v2 = _rotl(v2, 32)
+
+    tail = len(data) & 7
+    for i in range(0, len(data) - tail, 8):
+        m = int.from_bytes(data[i:i + 8], "little")
+        v3 ^= m
+        sip_round()
+        sip_round()
+        v0 ^= m
+
+    m = ((len(data) & 0xFF) << 56) | int.from_bytes(data[len(data) - tail:], "little")
+    v3 ^= m
+    sip_round()
+    sip_round()
+    v0 ^= m
+
+    v2 ^= 0xFF
+    for _ in range(4):
+        sip_round()
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def _rotl_batch(x, b):
+    return (x << np.uint64(b)) | (x >> np.uint64(64 - b))
+
+
+def siphash24_batch(k0, k1, messages):
+    # SipHash-2-4 of N equal-length messages, each with its own key (k0[i], k1[i]),
+    # so items from many blocks are hashed in the same vectorized pass
+    messages = np.ascontiguousarray(messages, dtype=np.uint8)
+    count, length = messages.shape
+    k0 = np.asarray(k0, dtype=np.uint64)
+    k1 = np.asarray(k1, dtype=np.uint64)
+
+    # Pad to whole 8-byte words; the final word carries the length in its top byte
+    words = length // 8 + 1
+    padded = np.zeros((count, words * 8), dtype=np.uint8)
+    padded[:, :length] = messages
+    padded[:, -1] = length & 0xFF
+    m = padded.view("<u8")
+
+    v0 = k0 ^ np.uint64(0x736F6D6570736575)
+    v1 = k1 ^ np.uint64(0x646F72616E646F6D)
+    v2 = k0 ^ np.uint64(0x6C7967656E657261)
+    v3 = k1 ^ np.uint64(0x7465646279746573)
+
+    def sip_round(v0, v1, v2, v3):
+        v0 = v0 + v1
+        v1 = _rotl_batch(v1, 13) ^ v0
+        v0 = _rotl_batch(v0, 32)
+        v2 = v2 + v3
+        v3 = _rotl_batch(v3, 16) ^ v2
+        v0 = v0 + v3
+        v3 = _rotl_batch(v3, 21) ^ v0
+        v2 = v2 + v1
+        v1 = _rotl_batch(v1, 17) ^ v2
+        v2 = _rotl_batch(v2, 32)
+        return v0, v1, v2, v3
+
+    for w in range(words):
+        word = m[:, w]
+        v3 = v3 ^ word
+        v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+        v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+        v0 = v0 ^ word
+
+    v2 = v2 ^ np.uint64(0xFF)
+    for _ in range(4):
+        v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def _mulhi64(a, b):
+    # High 64 bits of a 64x64-bit product, built from 32-bit limbs
+    a_hi, a_lo = a >> np.uint64(32), a & _MASK32
+    b_hi, b_lo = b >> np.uint64(32), b & _MASK32
+    lo_lo = a_lo * b_lo
+    hi_lo = a_hi * b_lo
+    lo_hi = a_lo * b_hi
+    carry = ((hi_lo & _MASK32) + (lo_hi & _MASK32) + (lo_lo >> np.uint64(32))) >> np.uint64(32)
+    return a_hi * b_hi + (hi_lo >> np.uint64(32)) + (lo_hi >> np.uint64(32)) + carry
+
+
+def block_key(block_hash):
+    # The filter key is the first 16 bytes of the block hash, as two LE words
+    return int.from_bytes(block_hash[:8], "little"), int.from_bytes(block_hash[8:16], "little")
+
+
+def hash_to_range_batch(k0, k1, items, f):
+    # Map items uniformly onto [0, F) with SipHash and a 128-bit multiply-shift.
+    # Items are grouped by length so each group is one vectorized SipHash call.
+    k0 = np.asarray(k0, dtype=np.uint64)
+    k1 = np.asarray(k1, dtype=np.uint64)
+    f = np.asarray(f, dtype=np.uint64)
+    result = np.empty(len(items), dtype=np.uint64)
+
+    by_length = {}
+    for i, item in enumerate(items):
+        by_length.setdefault(len(item), []).append(i)
+    for length, rows in by_length.items():
+        rows = np.array(rows)
+        messages = np.frombuffer(b"".join(items[i] for i in rows), dtype=np.uint8).reshape(len(rows), length)
+        hashes = siphash24_batch(k0[rows], k1[rows], messages)
+        result[rows] = _mulhi64(hashes, f[rows])
+    return result
+
+
+#######################
+# Golomb-Rice coded sets
+#######################
+def _compact_size(n):
+    if n < 0xFD:
+        return bytes([n])
+    if n <= 0xFFFF:
+        return b"\xfd" + n.to_bytes(2, "little")
+    if n <= 0xFFFFFFFF:
+        return b"\xfe" + n.to_bytes(4, "little")
+    return b"\xff" + n.to_bytes(8, "little")
+
+
+def _read_compact_size(data):
+    first = data[0]
+    if first < 0xFD:
+        return first, 1
+    size = {0xFD: 2, 0xFE: 4, 0xFF: 8}[first]
+    return int.from_bytes(data[1:1 + size], "little"), 1 + size
+
+
+def golomb_encode(sorted_values, p=FILTER_P):
+    # Each delta becomes a unary quotient (q ones, then a zero) and p remainder bits
+    out = bytearray()
+    acc = 0
+    nbits = 0
+    mask = (1 << p) - 1
+    previous = 0
+    for value in sorted_values:
+        delta = value - previous
+        previous = value
+        q = delta >> p
+        acc = (((acc << (q + 1)) | ((1 << (q + 1)) - 2)) << p) | (delta & mask)
+        nbits += q + 1 + p
+        while nbits >= 8:
+            nbits -= 8
+            out.append((acc >> nbits) & 0xFF)
+        acc &= (1 << nbits) - 1
+    if nbits:
+        out.append((acc << (8 - nbits)) & 0xFF)
+    return bytes(out)
+
+
+def golomb_decode(data, n, p=FILTER_P):
+    # Lazily yield the n sorted values back out of the bit stream
+    bits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b") if data else ""
+    position = 0
+    value = 0
+    for _ in range(n):
+        zero = bits.find("0", position)
+        q = zero - position
+        position = zero + 1
+        value += (q << p) | int(bits[position:position + p], 2)
+        position += p
+        yield value
+
+
+@dataclass(frozen=True)
+class BlockFilter:
+    # A serialized BIP-158 basic filter: CompactSize(N) followed by the GCS bits
+    block_hash: bytes
+    data: bytes
+
+    @property
+    def n(self):
+        return _read_compact_size(self.data)[0]
+
+    @property
+    def key(self):
+        return block_key(self.block_hash)
+
+    def values(self):
+        n, offset = _read_compact_size(self.data)
+        return golomb_decode(self.data[offset:], n)
+
+    def match_sorted(self, sorted_queries):
+        # Sorted merge of pre-hashed queries against the lazily decoded filter;
+        # stops at the first common value
+        if not len(sorted_queries):
+            return False
+        queries = iter(sorted_queries)
+        query = next(queries)
+        for value in self.values():
+            while query < value:
+                query = next(queries, None)
+                if query is None:
+                    return False
+            if query == value:
+                return True
+        return False
+
+    def match_any(self, items):
+        n = self.n
+        if not n or not items:
+            return False
+        k0, k1 = self.key
+        count = len(items)
+        hashed = hash_to_range_batch([k0] * count, [k1] * count, list(items), [n * FILTER_M] * count)
+        return self.match_sorted(sorted(int(h) for h in hashed))
+
+
+def build_block_filters(blocks):
+    # Basic filters for many blocks at once. Every block's unique non-empty
+    # scripts are hashed together in one vectorized pass, then encoded per block.
+    items, k0s, k1s, fs, owners, counts = [], [], [], [], [], []
+    for block_number, block in enumerate(blocks):
+        scripts = {script for script in block.scripts if script}
+        k0, k1 = block_key(block.hash)
+        n = len(scripts)
+        items.extend(scripts)
+        k0s.extend([k0] * n)
+        k1s.extend([k1] * n)
+        fs.extend([n * FILTER_M] * n)
+        owners.extend([block_number] * n)
+        counts.append(n)
+
+    hashed = hash_to_range_batch(k0s, k1s, items, fs) if items else np.empty(0, dtype=np.uint64)
+    # Sort by (block, value) so each block's values come out as one sorted run
+    order = np.lexsort((hashed, np.asarray(owners, dtype=np.int64)))
+    hashed = hashed[order].tolist()
+
+    filters = []
+    offset = 0
+    for block, n in zip(blocks, counts):
+        encoded = golomb_encode(hashed[offset:offset + n])
+        filters.append(BlockFilter(block.hash, _compact_size(n) + encoded))
+        offset += n
+    return filters
+
+
+def scan_filters(filters, items, chunk_size=1024):
+    # Indices of the filters that match any of the items. The whole query set
+    # is hashed once per filter (the key differs per block) in vectorized
+    # chunks of filters, then each filter is checked with one sorted merge.
+    matches = []
+    groups = {}
+    for item in items:
+        groups.setdefault(len(item), []).append(item)
+    if not groups:
+        return matches
+    # One (count, length) message matrix per item length, built once
+    groups = [
+        np.frombuffer(b"".join(group), dtype=np.uint8).reshape(len(group), length)
+        for length, group in groups.items()
+    ]
+
+    for chunk_start in range(0, len(filters), chunk_size):
+        chunk = filters[chunk_start:chunk_start + chunk_size]
+        keys = np.array([block_filter.key for block_filter in chunk], dtype=np.uint64)
+        ns = np.array([block_filter.n for block_filter in chunk], dtype=np.uint64)
+
+        hashed = []
+        for messages in groups:
+            count = len(messages)
+            hashes = siphash24_batch(
+                np.repeat(keys[:, 0], count),
+                np.repeat(keys[:, 1], count),
+                np.tile(messages, (len(chunk), 1)),
+            )
+            ranges = _mulhi64(hashes, np.repeat(ns * np.uint64(FILTER_M), count))
+            hashed.append(ranges.reshape(len(chunk), count))
+        hashed = np.concatenate(hashed, axis=1)
+        hashed.sort(axis=1)
+
+        for i, block_filter in enumerate(chunk):
+            if ns[i] and block_filter.match_sorted(hashed[i].tolist()):
+                matches.append(chunk_start + i)
+    return matches
+
+
+if __name__ == "__main__":
+    # Light-client restore demo: python compact_filters.py --blocks 100000
+    from bip32 import Keychain
+    from seed_derivation import mnemonic_to_seed
+    from synthetic_chain import build_synthetic_chain, p2wpkh_script
+    from wallet_scan import GAP_LIMIT
+
+    parser = argparse.ArgumentParser(description="Time BIP-158 filter building and matching")
+    parser.add_argument("--blocks", type=int, default=100000)
+    parser.add_argument("--noise", type=int, default=10, help="unrelated outputs per block")
+    parser.add_argument("--used", type=int, default=20, help="used receive addresses")
+    args = parser.parse_args()
+
+    mnemonic = " ".join(["abandon"] * 11 + ["about"])
+    account = Keychain.from_seed(mnemonic_to_seed(mnemonic)).derive("m/84'/0'/0'").neuter()
+
+    start = time.perf_counter()
+    chain = build_synthetic_chain(account, args.used, args.used // 3, args.blocks, args.noise)
+    print(f"Built {len(chain)} synthetic blocks in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    filters = build_block_filters(chain.blocks)
+    filter_bytes = sum(len(f.data) for f in filters)
+    print(f"Built {len(filters)} filters ({filter_bytes / 1e6:.1f} MB) in {time.perf_counter() - start:.2f}s")
+
+    # The wallet's query set: every script up to the gap limit past the last used one
+    script_index = chain.script_index()
+    queries = []
+    for chain_index in (0, 1):
+        pubkeys = account.child(chain_index).public_children(0, args.used * 4 + GAP_LIMIT)
+        queries.extend(p2wpkh_script(pubkey) for pubkey in pubkeys)
+
+    start = time.perf_counter()
+    matched = scan_filters(filters, queries)
+    elapsed = time.perf_counter() - start
+
+    wanted = set(queries)
+    true_matches = [h for h in matched if wanted.intersection(chain.blocks[h].scripts)]
+    print(
+        f"Matched {len(queries)} scripts against {len(filters)} filters in {elapsed:.2f}s: "
+        f"{len(true_matches)} blocks to fetch, {len(matched) - len(true_matches)} false positives"
+    )
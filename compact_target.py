@@ -0,0 +1,209 @@
+import argparse
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+# Mainnet proof-of-work limit; its target is difficulty 1
+POW_LIMIT_BITS = 0x1D00FFFF
+HASH_BITS = 256
+
+# Compact form: target = mantissa * 256^(exponent - 3), 23-bit mantissa
+# (the 24th bit is a sign bit that valid targets never set)
+_MANTISSA_MASK = 0x007FFFFF
+
+
+def split_bits(bits):
+    bits = np.atleast_1d(np.asarray(bits, dtype=np.uint32))
+    return (bits & _MANTISSA_MASK).astype(np.int64), 8 * (bits >> 24).astype(np.int64) - 24
+
+
+#######################
+# Exact path: 256-bit values as object arrays of Python ints
+#######################
+def bits_to_target(bits):
+    mantissa, shift = split_bits(bits)
+    mantissa = mantissa.astype(object)
+    targets = np.empty(len(shift), dtype=object)
+    left = shift >= 0
+    targets[left] = mantissa[left] << shift[left].astype(object)
+    targets[~left] = mantissa[~left] >> (-shift[~left]).astype(object)
+    return targets
+
+
+def target_to_bits(target):
+    # Bitcoin Core's GetCompact: three bytes of mantissa, truncated
+    target = int(target)
+    size = (target.bit_length() + 7) // 8
+    if size <= 3:
+        compact = target << (8 * (3 - size))
+    else:
+        compact = target >> (8 * (size - 3))
+    # Keep the sign bit clear by moving to a larger exponent
+    if compact & 0x00800000:
+        compact >>= 8
+        size += 1
+    return compact | (size << 24)
+
+
+_target_to_bits = np.frompyfunc(target_to_bits, 1, 1)
+
+
+def targets_to_bits(targets):
+    return _target_to_bits(np.asarray(targets, dtype=object)).astype(np.uint32)
+
+
+POW_LIMIT = int(bits_to_target(POW_LIMIT_BITS)[0])
+DIFF1_TARGET = POW_LIMIT
+
+
+def target_to_difficulty(targets):
+    return (DIFF1_TARGET / np.asarray(targets, dtype=object)).astype(np.float64)
+
+
+def block_work(bits):
+    # Expected hashes per block, 2^256 / (target + 1), exactly. Work only
+    # changes at retargets, so it is computed once per distinct nBits.
+    unique, inverse = np.unique(np.asarray(bits, dtype=np.uint32), return_inverse=True)
+    work = (1 << HASH_BITS) // (bits_to_target(unique) + 1)
+    return work[inverse]
+
+
+def chainwork(bits):
+    # Cumulative work at each height, as bitcoind reports it
+    return np.cumsum(block_work(bits))
+
+
+#######################
+# Float path: fully vectorized, for charts and annotations
+#######################
+def bits_to_log2_target(bits):
+    mantissa, shift = split_bits(bits)
+    with np.errstate(divide="ignore"):
+        return np.log2(mantissa) + shift
+
+
+def bits_to_difficulty(bits):
+    # 0xffff * 2^208 / (mantissa * 2^shift), without building the target
+    mantissa, shift = split_bits(bits)
+    with np.errstate(divide="ignore"):
+        return np.ldexp(0xFFFF / mantissa, 208 - shift)
+
+
+def bits_to_work(bits):
+    # 2^256 / target; the +1 changes nothing at float precision
+    mantissa, shift = split_bits(bits)
+    with np.errstate(divide="ignore"):
+        return np.ldexp(1.0 / mantissa, HASH_BITS - shift)
+
+
+def log2_target(targets):
+    # log2 of exact targets (Python ints of any size)
+    return np.frompyfunc(math.log2, 1, 1)(np.asarray(targets, dtype=object)).astype(np.float64)
+
+
+#######################
+# Limb path: 256-bit values as four little-endian uint64 limbs
+#######################
+def bits_to_limbs(bits):
+    mantissa, shift = split_bits(bits)
+    limbs = np.zeros((len(shift), 4), dtype=np.uint64)
+    rows = np.arange(len(shift))
+    right = shift < 0
+    mantissa = np.where(right, mantissa >> np.where(right, -shift, 0), mantissa).astype(np.uint64)
+    shift = np.maximum(shift, 0)
+    index, offset = shift // 64, (shift % 64).astype(np.uint64)
+    low = index < 4
+    limbs[rows[low], index[low]] = mantissa[low] << offset[low]
+    # A 23-bit mantissa straddles two limbs when shifted past bit 41
+    spill = low & (index + 1 < 4) & (offset > 41)
+    limbs[rows[spill], index[spill] + 1] = mantissa[spill] >> (np.uint64(64) - offset[spill])
+    return limbs
+
+
+def hashes_to_limbs(hashes):
+    # Block hashes as serialized (little endian, as hashed), 32 bytes each
+    data = hashes if isinstance(hashes, (bytes, bytearray, memoryview)) else b"".join(hashes)
+    return np.frombuffer(data, dtype="<u8").reshape(-1, 4)
+
+
+def limbs_le(a, b):
+    # Row-wise a <= b, deciding on the most significant differing limb
+    a, b = np.broadcast_arrays(np.asarray(a), np.asarray(b))
+    differs = a != b
+    top = 3 - np.argmax(differs[:, ::-1], axis=1)
+    rows = np.arange(len(a))
+    return ~differs.any(axis=1) | (a[rows, top] < b[rows, top])
+
+
+def limbs_to_ints(limbs):
+    return np.array([
+        int.from_bytes(np.ascontiguousarray(row, dtype="<u8").tobytes(), "little") for row in limbs
+    ], dtype=object)
+
+
+def hashes_meet_target(hashes, bits):
+    # The proof-of-work check for a batch of headers: hash <= target
+    return limbs_le(hashes_to_limbs(hashes), bits_to_limbs(bits))
+
+
+#######################
+# Log-scale hash space axis
+#######################
+@dataclass(frozen=True)
+class LogTargetAxis:
+    # A NumberLine over log2 of the hash space: targets that differ by a
+    # factor of 2^40 and by 1.3x are both visible on one line
+    low: int
+    high: int = HASH_BITS
+    step: int = 16
+
+    @classmethod
+    def covering(cls, bits, step=16):
+        # From just below the smallest target in `bits` to the top of the hash space
+        low = int(np.floor(np.min(bits_to_log2_target(bits)) / step) * step)
+        return cls(low=low, high=HASH_BITS, step=step)
+
+    @property
+    def x_range(self):
+        return [self.low, self.high, self.step]
+
+    def ticks(self):
+        return list(range(self.low, self.high + 1, self.step))
+
+    def position(self, target=None, bits=None):
+        # Axis coordinate of an exact target or an nBits value
+        if bits is not None:
+            value = float(bits_to_log2_target(bits)[0])
+        else:
+            value = math.log2(int(target)) if target else float(self.low)
+        return min(max(value, self.low), self.high)
+
+
+if __name__ == "__main__":
+    # Cross-check the three paths and time them over a whole header history
+    from retarget import HEADER_HISTORY_PATH, header_history
+
+    parser = argparse.ArgumentParser(description="Time nBits/target/difficulty/chainwork conversions")
+    parser.add_argument("path", nargs="?", default=HEADER_HISTORY_PATH, help="header history (see retarget.py)")
+    args = parser.parse_args()
+    _, bits = header_history(args.path)
+
+    for name, func in (
+        ("difficulty (float)", bits_to_difficulty),
+        ("log2 target (float)", bits_to_log2_target),
+        ("target limbs", bits_to_limbs),
+        ("chainwork (exact)", chainwork),
+        ("targets (exact)", bits_to_target),
+    ):
+        start = time.perf_counter()
+        func(bits)
+        print(f"{name:<22} {len(bits)} headers in {(time.perf_counter() - start) * 1000:7.1f} ms")
+
+    sample = np.unique(bits)
+    exact = bits_to_target(sample)
+    assert (limbs_to_ints(bits_to_limbs(sample)) == exact).all()
+    assert (targets_to_bits(exact) == sample).all()
+    assert np.allclose(bits_to_difficulty(sample), target_to_difficulty(exact))
+    print(f"Paths agree on {len(sample)} distinct nBits; total chainwork {chainwork(bits)[-1]:#x}")
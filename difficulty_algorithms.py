@@ -0,0 +1,174 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from retarget import BLOCKS_PER_EPOCH, MAX_ADJUSTMENT, TARGET_SPACING, TARGET_TIMESPAN
+from retarget_simulation import hashrate_shock
+
+
+#######################
+# Algorithms
+#######################
+# Each algorithm sets the difficulty of block `height` for every trial at
+# once from the times and difficulties of the blocks before it, both shaped
+# (height, trials). Difficulty is in hashrate units: at hashrate H a block at
+# difficulty D takes TARGET_SPACING * D / H seconds on average.
+class DifficultyAlgorithm:
+    name = "constant"
+
+    def next_difficulty(self, height, times, difficulty, initial):
+        return difficulty[height - 1] if height else initial
+
+
+class BitcoinEpoch(DifficultyAlgorithm):
+    # Retarget every 2016 blocks from the first-to-last timespan of the
+    # epoch (2015 intervals), clamped to 4x either way
+    name = "Bitcoin"
+
+    def next_difficulty(self, height, times, difficulty, initial):
+        if height == 0:
+            return initial
+        if height % BLOCKS_PER_EPOCH:
+            return difficulty[height - 1]
+        span = times[height - 1] - times[height - BLOCKS_PER_EPOCH]
+        span = np.clip(span, TARGET_TIMESPAN / MAX_ADJUSTMENT, TARGET_TIMESPAN * MAX_ADJUSTMENT)
+        return difficulty[height - 1] * TARGET_TIMESPAN / span
+
+
+class Asert(DifficultyAlgorithm):
+    # Absolutely scheduled exponential rise targeting (aserti3-2d): the
+    # difficulty halves for every `halflife` seconds the chain is behind its
+    # ideal schedule from the anchor block (here the first block)
+    name = "ASERT"
+
+    def __init__(self, halflife=2 * 24 * 60 * 60):
+        self.halflife = halflife
+
+    def next_difficulty(self, height, times, difficulty, initial):
+        if height == 0:
+            return initial
+        behind = times[height - 1] - TARGET_SPACING * height
+        return initial * np.exp2(-behind / self.halflife)
+
+
+class Lwma(DifficultyAlgorithm):
+    # Linearly weighted moving average (LWMA-1): average difficulty of the
+    # last `window` blocks over their solve times, the newest weighted most
+    name = "LWMA"
+
+    def __init__(self, window=144):
+        self.window = window
+        self.weights = np.arange(1, window + 1, dtype=np.float64)
+
+    def next_difficulty(self, height, times, difficulty, initial):
+        if height <= self.window:
+            return difficulty[height - 1] if height else initial
+        solve_times = np.diff(times[height - self.window - 1:height], axis=0)
+        solve_times = np.clip(solve_times, -6 * TARGET_SPACING, 6 * TARGET_SPACING)
+        weighted = self.weights @ solve_times / self.weights.sum()
+        return difficulty[height - self.window:height].mean(axis=0) * TARGET_SPACING / weighted
+
+
+ALGORITHMS = (BitcoinEpoch, Asert, Lwma)
+
+
+#######################
+# Batched driver
+#######################
+@dataclass
+class AlgorithmRun:
+    # Columnar (blocks, trials) arrays for one algorithm
+    name: str
+    hashrate: np.ndarray
+    difficulty: np.ndarray
+    times: np.ndarray
+
+    @property
+    def intervals(self):
+        return np.diff(self.times, axis=0, prepend=0)
+
+    def block_time_curve(self, window=144, step=72):
+        # (median time in days, median rolling block interval in minutes),
+        # sampled every `step` blocks, for plotting
+        rolling = np.cumsum(self.intervals, axis=0, dtype=np.float64)
+        rolling = (rolling[window:] - rolling[:-window]) / window
+        sample = np.arange(0, len(rolling), step)
+        days = np.median(self.times[window:][sample], axis=1) / 86400
+        return days, np.median(rolling[sample], axis=1) / 60
+
+
+def block_hashrate_shock(blocks, at, factor, hashrate=1.0):
+    # retarget_simulation.hashrate_shock's step change, indexed by block
+    # instead of by epoch: `hashrate` until block `at`, then times `factor`
+    return hashrate_shock(blocks, at, factor, hashrate)
+
+
+def simulate(algorithm, hashrate, trials=200, seed=0, initial=1.0):
+    # The same seed gives every algorithm the same exponential draws, so
+    # their curves differ only by the algorithm
+    hashrate = np.asarray(hashrate, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    draws = rng.standard_exponential((len(hashrate), trials))
+    times = np.empty((len(hashrate), trials))
+    difficulty = np.empty((len(hashrate), trials))
+    now = np.zeros(trials)
+    for height in range(len(hashrate)):
+        difficulty[height] = algorithm.next_difficulty(height, times, difficulty, initial)
+        now = now + TARGET_SPACING * difficulty[height] / hashrate[height] * draws[height]
+        times[height] = now
+    return AlgorithmRun(algorithm.name, hashrate, difficulty.astype(np.float32), times)
+
+
+def compare_algorithms(algorithms, hashrate, trials=200, seed=0, max_workers=None):
+    # One process per algorithm, all replaying the same hashrate and draws
+    workers = min(max_workers or os.cpu_count() or 1, len(algorithms))
+    if workers <= 1:
+        return [simulate(algorithm, hashrate, trials, seed) for algorithm in algorithms]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(simulate, algorithm, hashrate, trials, seed) for algorithm in algorithms]
+        return [future.result() for future in futures]
+
+
+def save_runs(path, runs):
+    columns = {"hashrate": runs[0].hashrate}
+    for run in runs:
+        columns[f"{run.name}.difficulty"] = run.difficulty
+        columns[f"{run.name}.times"] = run.times
+    np.savez(path, **columns)
+
+
+def load_runs(path):
+    with np.load(path) as data:
+        names = [key[:-len(".difficulty")] for key in data.files if key.endswith(".difficulty")]
+        return [AlgorithmRun(name, data["hashrate"], data[f"{name}.difficulty"], data[f"{name}.times"])
+                for name in names]
+
+
+if __name__ == "__main__":
+    # python difficulty_algorithms.py --epochs 6 --shock 0.5 --save /tmp/shock.npz
+    parser = argparse.ArgumentParser(description="Replay a hashrate shock through each difficulty algorithm")
+    parser.add_argument("--epochs", type=int, default=6, help="run length in 2016-block epochs")
+    parser.add_argument("--shock", type=float, default=0.5, help="hashrate factor after the shock")
+    parser.add_argument("--at", type=float, default=1.5, help="shock position, in epochs")
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--save", help="write the columnar runs as .npz")
+    args = parser.parse_args()
+
+    blocks = args.epochs * BLOCKS_PER_EPOCH
+    hashrate = block_hashrate_shock(blocks, int(args.at * BLOCKS_PER_EPOCH), args.shock)
+    start = time.perf_counter()
+    runs = compare_algorithms([cls() for cls in ALGORITHMS], hashrate, args.trials, max_workers=args.workers)
+    print(f"{len(runs)} algorithms x {blocks} blocks x {args.trials} trials in {time.perf_counter() - start:.1f}s")
+
+    for run in runs:
+        days, minutes = run.block_time_curve()
+        print(f"  {run.name:<8} slowest rolling block time {minutes.max():5.1f} min, "
+              f"mean {run.intervals.mean() / 60:5.2f} min, run length {np.median(run.times[-1]) / 86400:5.1f} days")
+    if args.save:
+        save_runs(args.save, runs)
+        print(f"Saved {args.save}")
@@ -0,0 +1,216 @@
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+
+from bit_buffer import BitBuffer
+from bip39_wordlist import BITS_PER_WORD, WORDS, words_for_indices, indices_for_words
+
+# Entropy sizes allowed by BIP-39: 128, 160, 192, 224 and 256 bits
+VALID_ENTROPY_BYTES = (16, 20, 24, 28, 32)
+# ...which make mnemonics of 12, 15, 18, 21 and 24 words
+VALID_WORD_COUNTS = tuple((n * 8 + n // 4) // BITS_PER_WORD for n in VALID_ENTROPY_BYTES)
+
+# SHA-256 round constants and initial hash values
+_SHA256_K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], dtype=np.uint32)
+
+_SHA256_H0 = np.array([
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+], dtype=np.uint32)
+
+# Weights that turn a row of 11 bits into its integer value
+_WORD_BIT_WEIGHTS = (1 << np.arange(BITS_PER_WORD - 1, -1, -1)).astype(np.uint16)
+
+
+def _rotr(x, n):
+    return (x >> np.uint32(n)) | (x << np.uint32(32 - n))
+
+
+def sha256_batch(messages):
+    # Hash N equal-length messages at once. Entropy is at most 32 bytes, so every
+    # message fits into a single 64-byte block and needs one compression.
+    messages = np.ascontiguousarray(messages, dtype=np.uint8)
+    if messages.ndim != 2:
+        raise ValueError("Expected a 2-D (N, length) array of message bytes")
+    count, length = messages.shape
+    if length > 55:
+        raise ValueError("sha256_batch only handles messages of up to 55 bytes")
+
+    # Standard padding: 0x80, zeros, then the message length in bits (big-endian)
+    block = np.zeros((count, 64), dtype=np.uint8)
+    block[:, :length] = messages
+    block[:, length] = 0x80
+    block[:, 56:] = np.frombuffer((length * 8).to_bytes(8, "big"), dtype=np.uint8)
+
+    # Message schedule: 64 words per message, computed column by column
+    w = np.empty((64, count), dtype=np.uint32)
+    w[:16] = block.view(">u4").T
+    for t in range(16, 64):
+        s0 = _rotr(w[t - 15], 7) ^ _rotr(w[t - 15], 18) ^ (w[t - 15] >> np.uint32(3))
+        s1 = _rotr(w[t - 2], 17) ^ _rotr(w[t - 2], 19) ^ (w[t - 2] >> np.uint32(10))
+        w[t] = w[t - 16] + s0 + w[t - 7] + s1
+
+    a, b, c, d, e, f, g, h = (np.full(count, value, dtype=np.uint32) for value in _SHA256_H0)
+    for t in range(64):
+        s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ (~e & g)
+        temp1 = h + s1 + ch + _SHA256_K[t] + w[t]
+        s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        temp2 = s0 + maj
+        h, g, f, e, d, c, b, a = g, f, e, d + temp1, c, b, a, temp1 + temp2
+
+    state = np.stack([a, b, c, d, e, f, g, h], axis=1) + _SHA256_H0
+    return state.astype(">u4").view(np.uint8).reshape(count, 32)
+
+
+def checksum_length(entropy_length):
+    # One checksum bit per 32 bits of entropy
+    if entropy_length not in VALID_ENTROPY_BYTES:
+        raise ValueError(
+            f"Entropy must be one of {VALID_ENTROPY_BYTES} bytes long, got {entropy_length}"
+        )
+    return entropy_length * 8 // 32
+
+
+def _indices_from_bits(entropy, digests, cs_length):
+    # Append the checksum bits to the entropy bits and read them back 11 at a time
+    entropy_bits = np.unpackbits(entropy, axis=1)
+    checksum_bits = np.unpackbits(digests[:, :1], axis=1)[:, :cs_length]
+    combined = np.concatenate([entropy_bits, checksum_bits], axis=1)
+    segments = combined.reshape(len(entropy), combined.shape[1] // BITS_PER_WORD, BITS_PER_WORD)
+    indices = segments.astype(np.uint16) @ _WORD_BIT_WEIGHTS
+    return checksum_bits, indices
+
+
+@dataclass(frozen=True)
+class Mnemonic:
+    # The full derivation of one mnemonic, from raw entropy to words
+    entropy: bytes
+    digest: bytes
+    checksum_length: int
+    indices: tuple
+    words: tuple
+
+    @property
+    def phrase(self):
+        return " ".join(self.words)
+
+    # Bit views for display; slices of these share the packed bytes
+    @property
+    def entropy_bits(self):
+        return BitBuffer.from_bytes(self.entropy)
+
+    @property
+    def hash_bits(self):
+        return BitBuffer.from_bytes(self.digest)
+
+    @property
+    def checksum_bits(self):
+        return self.hash_bits[:self.checksum_length]
+
+    @property
+    def combined_bits(self):
+        return self.entropy_bits + self.checksum_bits
+
+    @property
+    def segments(self):
+        return self.combined_bits.chunks(BITS_PER_WORD)
+
+
+@dataclass(frozen=True)
+class MnemonicBatch:
+    # Column arrays for a batch of N mnemonics that share one entropy size
+    entropy: np.ndarray
+    digests: np.ndarray
+    checksum_bits: np.ndarray
+    indices: np.ndarray
+
+    @property
+    def words(self):
+        return words_for_indices(self.indices)
+
+    def __len__(self):
+        return len(self.entropy)
+
+    def __getitem__(self, i):
+        return Mnemonic(
+            entropy=self.entropy[i].tobytes(),
+            digest=self.digests[i].tobytes(),
+            checksum_length=self.checksum_bits.shape[1],
+            indices=tuple(int(index) for index in self.indices[i]),
+            words=tuple(WORDS[index] for index in self.indices[i]),
+        )
+
+
+def entropy_to_mnemonic(entropy):
+    # Single mnemonic: hashlib is faster than the vectorized path for one message
+    entropy = bytes(entropy)
+    cs_length = checksum_length(len(entropy))
+    digest = hashlib.sha256(entropy).digest()
+
+    combined = (int.from_bytes(entropy, "big") << cs_length) | (digest[0] >> (8 - cs_length))
+    word_count = (len(entropy) * 8 + cs_length) // BITS_PER_WORD
+    indices = tuple(
+        (combined >> (BITS_PER_WORD * (word_count - 1 - i))) & 0x7FF
+        for i in range(word_count)
+    )
+
+    return Mnemonic(
+        entropy=entropy,
+        digest=digest,
+        checksum_length=cs_length,
+        indices=indices,
+        words=tuple(WORDS[index] for index in indices),
+    )
+
+
+def batch_entropy_to_mnemonics(entropy):
+    # Batch of mnemonics: entropy is an (N, 16/20/24/28/32) uint8 array
+    entropy = np.ascontiguousarray(entropy, dtype=np.uint8)
+    if entropy.ndim != 2:
+        raise ValueError("Expected a 2-D (N, entropy_bytes) array")
+    cs_length = checksum_length(entropy.shape[1])
+
+    digests = sha256_batch(entropy)
+    checksum_bits, indices = _indices_from_bits(entropy, digests, cs_length)
+    return MnemonicBatch(entropy=entropy, digests=digests, checksum_bits=checksum_bits, indices=indices)
+
+
+def mnemonic_to_entropy(words):
+    # Inverse direction: recover the entropy and validate the checksum
+    if isinstance(words, str):
+        words = words.split()
+    indices = indices_for_words(words)
+
+    if len(indices) not in VALID_WORD_COUNTS:
+        raise ValueError(f"Mnemonic must be one of {VALID_WORD_COUNTS} words long, got {len(indices)}")
+    total_bits = len(indices) * BITS_PER_WORD
+    cs_length = total_bits // 33
+    entropy_length = (total_bits - cs_length) // 8
+
+    combined = 0
+    for index in indices:
+        combined = (combined << BITS_PER_WORD) | int(index)
+    entropy = (combined >> cs_length).to_bytes(entropy_length, "big")
+
+    expected = hashlib.sha256(entropy).digest()[0] >> (8 - cs_length)
+    if combined & ((1 << cs_length) - 1) != expected:
+        raise ValueError("Invalid mnemonic checksum")
+    return entropy
+
+
+def random_entropy_batch(count, entropy_length=16, rng=None):
+    # Convenience for batch jobs: N random entropy rows from a NumPy generator
+    checksum_length(entropy_length)
+    rng = np.random.default_rng() if rng is None else rng
+    return rng.integers(0, 256, size=(count, entropy_length), dtype=np.uint8)
@@ -0,0 +1,147 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import numpy as np
+
+from bip39_wordlist import BITS_PER_WORD, WORDLIST_SIZE, index_of, words_for_indices
+from mnemonic_engine import VALID_WORD_COUNTS, entropy_to_mnemonic, sha256_batch
+
+# Tokens that mark a forgotten word in a phrase
+UNKNOWN_TOKENS = ("?", "_", "*")
+MAX_UNKNOWN = 3
+
+_BIT_SHIFTS = np.arange(BITS_PER_WORD - 1, -1, -1, dtype=np.uint16)
+
+
+def parse_partial_phrase(phrase):
+    # "word word ? word ..." -> (template indices, unknown positions)
+    tokens = phrase.split() if isinstance(phrase, str) else list(phrase)
+    if len(tokens) not in VALID_WORD_COUNTS:
+        raise ValueError(f"Mnemonic must be one of {VALID_WORD_COUNTS} words long, got {len(tokens)}")
+
+    template = []
+    unknown = []
+    for position, token in enumerate(tokens):
+        if token in UNKNOWN_TOKENS:
+            unknown.append(position)
+            template.append(0)
+        else:
+            template.append(index_of(token))
+    if not 1 <= len(unknown) <= MAX_UNKNOWN:
+        raise ValueError(f"Expected 1 to {MAX_UNKNOWN} unknown words, got {len(unknown)}")
+    return np.array(template, dtype=np.uint16), tuple(unknown)
+
+
+def valid_checksum_mask(indices):
+    # Which rows of an (N, words) index array carry a correct checksum
+    count, word_count = indices.shape
+    total_bits = word_count * BITS_PER_WORD
+    cs_length = total_bits // 33
+    entropy_bits = total_bits - cs_length
+
+    bits = ((indices[:, :, None] >> _BIT_SHIFTS) & 1).astype(np.uint8).reshape(count, total_bits)
+    entropy = np.packbits(bits[:, :entropy_bits], axis=1)
+    expected = sha256_batch(entropy)[:, 0] >> (8 - cs_length)
+    actual = indices[:, -1] & ((1 << cs_length) - 1)
+    return expected == actual
+
+
+def search_range(template, unknown, first_lo, first_hi, chunk_rows=1 << 18):
+    # Worker task: try first_lo <= first unknown < first_hi, every value of the
+    # other unknowns, and return the candidates whose checksum is valid
+    rest = len(unknown) - 1
+    rows_per_value = WORDLIST_SIZE ** rest
+    total = (first_hi - first_lo) * rows_per_value
+
+    survivors = []
+    for start in range(0, total, chunk_rows):
+        linear = np.arange(start, min(start + chunk_rows, total), dtype=np.int64)
+        candidates = np.repeat(template[None, :], len(linear), axis=0)
+        for position in reversed(unknown[1:]):
+            candidates[:, position] = linear % WORDLIST_SIZE
+            linear //= WORDLIST_SIZE
+        candidates[:, unknown[0]] = first_lo + linear
+        survivors.append(candidates[valid_checksum_mask(candidates)])
+    return total, np.concatenate(survivors) if survivors else np.empty((0, len(template)), np.uint16)
+
+
+@dataclass
+class RecoveryResult:
+    candidates: np.ndarray
+    tested: int
+    seconds: float
+
+    @property
+    def candidates_per_second(self):
+        return self.tested / self.seconds if self.seconds else 0.0
+
+    def phrases(self):
+        return [" ".join(words) for words in words_for_indices(self.candidates)]
+
+
+def recover_missing_words(phrase, max_workers=None, tasks_per_worker=8, progress=None):
+    # Enumerate the unknown positions, keep only checksum-valid phrases.
+    # The search space is split on the first unknown word across a process pool;
+    # progress(done, total, tested, elapsed) is called as tasks finish.
+    template, unknown = parse_partial_phrase(phrase)
+    workers = max_workers or os.cpu_count() or 1
+
+    # Split the first unknown word's 2048 values into contiguous slices
+    task_count = min(WORDLIST_SIZE, workers * tasks_per_worker) if len(unknown) > 1 else 1
+    bounds = np.linspace(0, WORDLIST_SIZE, task_count + 1).astype(int)
+    slices = list(zip(bounds[:-1], bounds[1:]))
+
+    results = {}
+    tested = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(search_range, template, unknown, int(lo), int(hi)): task
+            for task, (lo, hi) in enumerate(slices)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            count, survivors = future.result()
+            results[futures[future]] = survivors
+            tested += count
+            if progress:
+                progress(done, len(slices), tested, time.perf_counter() - start)
+
+    candidates = np.concatenate([results[task] for task in range(len(slices))])
+    return RecoveryResult(candidates, tested, time.perf_counter() - start)
+
+
+def _print_progress(done, total, tested, elapsed):
+    rate = tested / elapsed if elapsed else 0.0
+    print(f"  {done}/{total} slices, {tested:,} candidates, {rate:,.0f} candidates/s", flush=True)
+
+
+if __name__ == "__main__":
+    # Demo: python mnemonic_recovery.py --missing 2
+    parser = argparse.ArgumentParser(description="Recover missing BIP-39 words using the checksum")
+    parser.add_argument("phrase", nargs="?", help="phrase with ? for each missing word")
+    parser.add_argument("--missing", type=int, default=2, help="words to blank out of a random phrase")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    phrase = args.phrase
+    if phrase is None:
+        rng = random.Random(0)
+        words = list(entropy_to_mnemonic(rng.getrandbits(128).to_bytes(16, "big")).words)
+        original = " ".join(words)
+        for position in rng.sample(range(len(words)), args.missing):
+            words[position] = "?"
+        phrase = " ".join(words)
+        print(f"Original: {original}")
+    print(f"Searching: {phrase}")
+
+    result = recover_missing_words(phrase, args.workers, progress=_print_progress)
+    print(
+        f"{len(result.candidates):,} checksum-valid phrases out of {result.tested:,} candidates "
+        f"in {result.seconds:.2f}s ({result.candidates_per_second:,.0f} candidates/s)"
+    )
+    if args.phrase is None:
+        print(f"Original phrase found: {original in result.phrases()}")
@@ -0,0 +1,85 @@
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from section_cache import RENDER_ONLY_ENV, section_names
+
+
+def load_scene_class(path, scene_name):
+    # Import a scene file the way manim does, by path (file names have dashes)
+    directory = os.path.dirname(os.path.abspath(path))
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, scene_name)
+
+
+def manim_command(path, scene_name, manim_args, media_dir=None):
+    command = [sys.executable, "-m", "manim", "render", *manim_args]
+    if media_dir:
+        command += ["--media_dir", media_dir]
+    return command + [path, scene_name]
+
+
+def render_section(path, scene_name, section, manim_args, media_dir):
+    # One manim process: every other section is fast-forwarded with its
+    # animations skipped, so this one starts from the right state. Its partial
+    # movies land in the section cache when the process tears down.
+    env = dict(os.environ, **{RENDER_ONLY_ENV: section})
+    start = time.perf_counter()
+    subprocess.run(
+        manim_command(path, scene_name, manim_args, media_dir),
+        env=env, check=True, stdout=subprocess.DEVNULL,
+    )
+    return section, time.perf_counter() - start
+
+
+def parallel_render(path, scene_name, manim_args=(), max_workers=None):
+    # Fill the section cache for every section at once, then run the normal
+    # render, which splices all sections from the cache and concatenates
+    # the partial movies without re-encoding them
+    sections = section_names(load_scene_class(path, scene_name))
+    workers = min(max_workers or os.cpu_count() or 1, len(sections)) or 1
+    timings = {}
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="sections-") as scratch:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(render_section, path, scene_name, section, manim_args,
+                            os.path.join(scratch, section))
+                for section in sections
+            ]
+            for future in futures:
+                section, seconds = future.result()
+                timings[section] = seconds
+                print(f"  {section}: {seconds:.1f}s", flush=True)
+
+    concat_start = time.perf_counter()
+    subprocess.run(manim_command(path, scene_name, manim_args), check=True)
+    end = time.perf_counter()
+    return timings, end - concat_start, end - start
+
+
+if __name__ == "__main__":
+    # python parallel_render.py bip-39-mnemonic.py BitcoinWalletAnimation -- -ql
+    parser = argparse.ArgumentParser(description="Render a scene's cached sections in parallel")
+    parser.add_argument("path")
+    parser.add_argument("scene")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("manim_args", nargs=argparse.REMAINDER, help="passed to manim render")
+    args = parser.parse_args()
+    manim_args = [arg for arg in args.manim_args if arg != "--"]
+
+    timings, concat_seconds, total = parallel_render(args.path, args.scene, manim_args, args.workers)
+    print(
+        f"{len(timings)} sections, longest {max(timings.values()):.1f}s, "
+        f"sum {sum(timings.values()):.1f}s; final splice {concat_seconds:.1f}s; total {total:.1f}s"
+    )
@@ -0,0 +1,217 @@
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+
+import av
+from manim.constants import DEFAULT_QUALITY, QUALITIES
+
+from parallel_render import manim_command
+from render_profiler import PROFILE_ENV
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(REPO_DIR, "render_baseline.json")
+
+# (scene file, scene class); both wallet files define BitcoinWalletAnimation
+SCENES = (
+    ("BitcoinTransactionScene.py", "BitcoinTransactionScene"),
+    ("bitcoin_difficulty_adjustment.py", "BitcoinDifficultyAdjustment"),
+    ("bip-39-mnemonic.py", "BitcoinWalletAnimation"),
+    ("hd-wallet.py", "BitcoinWalletAnimation"),
+)
+
+# Fixed configuration: low quality, no progress bars, and every render starts
+# with a cold manim and section cache (the text and SVG caches stay warm,
+# they are shared by every render anyway)
+MANIM_ARGS = ("-ql", "--progress_bar", "none", "--verbosity", "WARNING")
+SEED_ENV = {"PYTHONHASHSEED": "0"}
+
+# Per-section times below this are too noisy to flag
+MIN_SECTION_SECONDS = 0.5
+
+
+@dataclass
+class BenchmarkResult:
+    scene: str
+    wall_seconds: float
+    peak_rss_mb: float
+    frames: int
+    fps: float
+    sections: dict = field(default_factory=dict)
+
+
+def scene_id(path, scene_name):
+    return f"{path}:{scene_name}"
+
+
+def render(path, scene_name, manim_args, scratch, profile=False):
+    # One cold render into `scratch`: (wall seconds, peak RSS in MB)
+    env = dict(os.environ, **SEED_ENV, SECTION_CACHE_DIR=os.path.join(scratch, "sections"))
+    if profile:
+        env[PROFILE_ENV] = os.path.join(scratch, "profile")
+    else:
+        env.pop(PROFILE_ENV, None)
+    command = manim_command(os.path.join(REPO_DIR, path), scene_name, manim_args,
+                            os.path.join(scratch, "media"))
+    start = time.perf_counter()
+    process = subprocess.Popen(command, env=env, cwd=REPO_DIR,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    # wait4 gives this child's own peak RSS (kilobytes on Linux)
+    stderr = process.stderr.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        sys.stderr.write(stderr.decode(errors="replace"))
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return wall, usage.ru_maxrss / 1024
+
+
+def configured_frame_rate(manim_args):
+    # The frame rate manim renders at with these arguments
+    args = list(manim_args)
+    for flag in ("--fps", "--frame_rate"):
+        if flag in args:
+            return float(args[args.index(flag) + 1])
+    flags = [arg[2:] for arg in args if arg.startswith("-q") and len(arg) == 3]
+    if "--quality" in args:
+        flags.append(args[args.index("--quality") + 1])
+    for quality in QUALITIES.values():
+        if flags and quality["flag"] == flags[-1]:
+            return quality["frame_rate"]
+    return QUALITIES[DEFAULT_QUALITY]["frame_rate"]
+
+
+def count_frames(media_dir, scene_name, frame_rate):
+    # Output frames of the final movie (partial movies live in a
+    # subdirectory), from its timestamps rather than its encoded samples:
+    # StaticHoldMixin's "still" holds encode a whole hold as two samples
+    movies = [
+        movie for movie in glob.glob(os.path.join(media_dir, "videos", "**", f"{scene_name}.*"), recursive=True)
+        if "partial_movie_files" not in movie
+    ]
+    with av.open(movies[0]) as container:
+        stream = container.streams.video[0]
+        timestamps = [packet.pts for packet in container.demux(stream) if packet.pts is not None]
+    return round((max(timestamps) - min(timestamps)) * stream.time_base * frame_rate) + 1
+
+
+def section_times(path, scene_name, manim_args=MANIM_ARGS):
+    # Per-section cost from a separate profiled render. These include the
+    # profiler's own overhead, so only compare them with each other.
+    with tempfile.TemporaryDirectory(prefix="render-benchmark-") as scratch:
+        render(path, scene_name, manim_args, scratch, profile=True)
+        with open(os.path.join(scratch, "profile", f"{scene_name}.json")) as f:
+            profile = json.load(f)
+
+    sections = defaultdict(float)
+    for record in profile["plays"]:
+        sections[record["section"] or "scene"] += record["construct"] + record["play"] + record["encode"]
+    return dict(sections)
+
+
+def run_scene(path, scene_name, manim_args=MANIM_ARGS, sections=True):
+    # Wall time, RSS and fps come from a render with profiling off; the
+    # section breakdown, if wanted, from a second, profiled render
+    with tempfile.TemporaryDirectory(prefix="render-benchmark-") as scratch:
+        wall, peak_rss_mb = render(path, scene_name, manim_args, scratch)
+        frames = count_frames(os.path.join(scratch, "media"), scene_name, configured_frame_rate(manim_args))
+    return BenchmarkResult(
+        scene=scene_id(path, scene_name),
+        wall_seconds=wall,
+        peak_rss_mb=peak_rss_mb,
+        frames=frames,
+        fps=frames / wall if wall else 0.0,
+        sections=section_times(path, scene_name, manim_args) if sections else {},
+    )
+
+
+def compare(results, baseline, threshold):
+    # Regressions worse than `threshold` (0.2 = 20%) against the baseline
+    regressions = []
+    for result in results:
+        base = baseline.get(result.scene)
+        if base is None:
+            continue
+        checks = [
+            ("wall time", result.wall_seconds, base["wall_seconds"], 1),
+            ("peak RSS", result.peak_rss_mb, base["peak_rss_mb"], 1),
+            ("fps", result.fps, base["fps"], -1),
+        ]
+        for section, seconds in result.sections.items():
+            base_seconds = base["sections"].get(section)
+            if base_seconds is not None and max(seconds, base_seconds) >= MIN_SECTION_SECONDS:
+                checks.append((f"section {section}", seconds, base_seconds, 1))
+        for name, value, base_value, direction in checks:
+            if base_value <= 0:
+                continue
+            change = (value - base_value) / base_value * direction
+            if change > threshold:
+                regressions.append((result.scene, name, base_value, value, change))
+    return regressions
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["scenes"]
+
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump({"manim_args": list(MANIM_ARGS),
+                   "scenes": {result.scene: asdict(result) for result in results}}, f, indent=2)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    # python render_benchmark.py                      compare against render_baseline.json
+    # python render_benchmark.py --update-baseline    record a new baseline
+    parser = argparse.ArgumentParser(description="Benchmark the scene renders against a stored baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--only", action="append", help="substring of scene file or class to run")
+    parser.add_argument("--no-sections", action="store_true",
+                        help="skip the profiled render that gives the per-section breakdown")
+    args = parser.parse_args()
+
+    scenes = [
+        (path, name) for path, name in SCENES
+        if not args.only or any(part in scene_id(path, name) for part in args.only)
+    ]
+    results = []
+    for path, name in scenes:
+        result = run_scene(path, name, sections=not args.no_sections)
+        results.append(result)
+        print(
+            f"{result.scene:<50} {result.wall_seconds:7.1f}s {result.peak_rss_mb:7.0f} MB "
+            f"{result.frames:6d} frames {result.fps:6.1f} fps",
+            flush=True,
+        )
+        for section, seconds in result.sections.items():
+            print(f"    {section:<46} {seconds:7.1f}s")
+
+    if args.update_baseline:
+        # Keep entries for scenes that were not part of this run
+        merged = {scene: BenchmarkResult(**entry) for scene, entry in load_baseline(args.baseline).items()}
+        merged.update({result.scene: result for result in results})
+        save_baseline(args.baseline, list(merged.values()))
+        print(f"Baseline written to {args.baseline}")
+        sys.exit(0)
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        sys.exit(0)
+    regressions = compare(results, baseline, args.threshold)
+    for scene, name, base_value, value, change in regressions:
+        print(f"REGRESSION {scene} {name}: {base_value:.2f} -> {value:.2f} ({change:+.0%})")
+    sys.exit(1 if regressions else 0)
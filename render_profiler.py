@@ -0,0 +1,212 @@
+import json
+import linecache
+import os
+import sys
+import time
+
+import manim
+from manim import Animation, Mobject, config
+
+# Opt-in: SCENE_PROFILE=1 manim -ql scene.py Scene (or SCENE_PROFILE=<dir>)
+PROFILE_ENV = "SCENE_PROFILE"
+TOP_ENV = "SCENE_PROFILE_TOP"
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "profiles")
+
+PHASES = ("construct", "overhead", "interpolate", "rasterize", "encode")
+
+_MANIM_DIR = os.path.dirname(os.path.abspath(manim.__file__))
+_REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+# Scene mixins that sit between a scene's code and manim's play()
+_MIXIN_FILES = {
+    os.path.join(_REPO_DIR, name)
+    for name in ("render_profiler.py", "section_cache.py", "static_holds.py", "static_layers.py")
+}
+
+
+def _caller_line():
+    # First frame outside manim and the repo's scene mixins: the scene's own
+    # self.play(...)/self.wait(...) line
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = os.path.abspath(frame.f_code.co_filename)
+        if not path.startswith(_MANIM_DIR) and path not in _MIXIN_FILES:
+            return path, frame.f_lineno, frame.f_code.co_name
+        frame = frame.f_back
+    return "?", 0, "?"
+
+
+def _describe(arg):
+    if isinstance(arg, Animation):
+        return type(arg).__name__
+    if isinstance(arg, Mobject):
+        return f"Add({type(arg).__name__})"
+    mobject = getattr(arg, "mobject", None)
+    return f"{type(mobject).__name__}.animate" if mobject is not None else type(arg).__name__
+
+
+class RenderProfilerMixin:
+    # Times every self.play()/self.wait() of a scene when SCENE_PROFILE is set:
+    # scene code run since the previous call (construct), manim's own setup
+    # and hashing (overhead), interpolation, rasterization and background
+    # encoding. Writes <Scene>.json (Chrome/Perfetto trace events plus one
+    # record per call) and <Scene>.folded (flamegraph.pl / speedscope) and
+    # prints the slowest calls when the scene finishes.
+
+    def setup(self):
+        super().setup()
+        target = os.environ.get(PROFILE_ENV)
+        self._profile = None
+        if not target:
+            return
+
+        self._profile = []
+        self._profile_dir = DEFAULT_PROFILE_DIR if target == "1" else target
+        self._profile_current = None
+        self._profile_last_end = time.perf_counter()
+        self._profile_origin = self._profile_last_end
+
+        # Wrap the per-frame steps on this instance only
+        self.update_to_time = self._profile_timed(self.update_to_time, "interpolate")
+        renderer = self.renderer
+        renderer.update_frame = self._profile_timed(renderer.update_frame, "rasterize")
+        renderer.scene_finished = self._profile_finished(renderer.scene_finished)
+        writer = renderer.file_writer
+        if hasattr(writer, "_create_segment_encoder"):
+            writer._create_segment_encoder = self._profile_encoder(writer._create_segment_encoder)
+
+    def _profile_timed(self, func, phase):
+        def timed(*args, **kwargs):
+            record = self._profile_current
+            if record is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record[phase] += time.perf_counter() - start
+
+        return timed
+
+    def _profile_encoder(self, create):
+        # Encoding runs on a worker thread; charge it to the play that opened it
+        def create_encoder(target):
+            encoder = create(target)
+            record = self._profile_current
+            if record is not None:
+                encoder.write_frame = self._profile_thread_timed(encoder.write_frame, record)
+                encoder.finish = self._profile_thread_timed(encoder.finish, record)
+            return encoder
+
+        return create_encoder
+
+    @staticmethod
+    def _profile_thread_timed(func, record):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record["encode"] += time.perf_counter() - start
+
+        return timed
+
+    def play(self, *args, **kwargs):
+        if self._profile is None:
+            return super().play(*args, **kwargs)
+
+        path, line, function = _caller_line()
+        start = time.perf_counter()
+        sections = getattr(self.renderer.file_writer, "sections", None)
+        record = {
+            "index": len(self._profile),
+            "section": sections[-1].name if sections else "",
+            "source": f"{os.path.relpath(path)}:{line}",
+            "function": function,
+            "code": linecache.getline(path, line).strip(),
+            "animations": [_describe(arg) for arg in args],
+            "start": start - self._profile_origin,
+            "construct": start - self._profile_last_end,
+            **{phase: 0.0 for phase in PHASES[1:]},
+        }
+        self._profile_current = record
+        try:
+            return super().play(*args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            self._profile_current = None
+            self._profile_last_end = end
+            family = self.get_mobject_family_members()
+            record["mobjects"] = len(family)
+            record["points"] = int(sum(len(mob.points) for mob in family))
+            record["run_time"] = self.duration
+            record["play"] = end - start
+            record["overhead"] = max(0.0, record["play"] - record["interpolate"] - record["rasterize"])
+            self._profile.append(record)
+
+    def _profile_finished(self, scene_finished):
+        # Encoders are joined inside scene_finished, so encode times are final
+        def finished(*args, **kwargs):
+            result = scene_finished(*args, **kwargs)
+            if self._profile:
+                self.write_profile()
+            return result
+
+        return finished
+
+    def write_profile(self):
+        name = type(self).__name__
+        os.makedirs(self._profile_dir, exist_ok=True)
+        json_path = os.path.join(self._profile_dir, f"{name}.json")
+        folded_path = os.path.join(self._profile_dir, f"{name}.folded")
+
+        events = []
+        for record in self._profile:
+            events.append({
+                "name": f"{record['source']} {'+'.join(record['animations'])}",
+                "cat": record["section"],
+                "ph": "X",
+                "ts": record["start"] * 1e6,
+                "dur": record["play"] * 1e6,
+                "pid": 0,
+                "tid": 0,
+                "args": {key: record[key] for key in ("code", "mobjects", "points", "run_time", *PHASES)},
+            })
+        with open(json_path, "w") as f:
+            json.dump({
+                "scene": name,
+                "frame_rate": config.frame_rate,
+                "plays": self._profile,
+                "traceEvents": events,
+            }, f, indent=1)
+
+        # Folded stacks: scene;section;line animations;phase microseconds
+        with open(folded_path, "w") as f:
+            for record in self._profile:
+                frame = f"{record['source']} {'+'.join(record['animations'])}".replace(";", ",")
+                for phase in PHASES:
+                    micros = int(record[phase] * 1e6)
+                    if micros:
+                        f.write(f"{name};{record['section'] or 'scene'};{frame};{phase} {micros}\n")
+
+        self.print_profile(int(os.environ.get(TOP_ENV, 15)))
+        print(f"Profile written to {json_path} and {folded_path}", file=sys.stderr)
+
+    def print_profile(self, top=15):
+        def cost(record):
+            return record["construct"] + record["play"] + record["encode"]
+
+        rows = sorted(self._profile, key=cost, reverse=True)[:top]
+        total = sum(cost(record) for record in self._profile)
+        print(f"\nSlowest {len(rows)} of {len(self._profile)} calls ({total:.2f}s total)", file=sys.stderr)
+        print(
+            f"{'total':>7} {'constr':>7} {'interp':>7} {'raster':>7} {'encode':>7} "
+            f"{'mobs':>5} {'points':>8}  source",
+            file=sys.stderr,
+        )
+        for record in rows:
+            print(
+                f"{cost(record):7.2f} {record['construct']:7.2f} {record['interpolate']:7.2f} "
+                f"{record['rasterize']:7.2f} {record['encode']:7.2f} {record['mobjects']:5d} "
+                f"{record['points']:8d}  {record['source']} {record['code'][:60]}",
+                file=sys.stderr,
+            )
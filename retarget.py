@@ -0,0 +1,220 @@
+import argparse
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from compact_target import (
+    POW_LIMIT, POW_LIMIT_BITS, bits_to_difficulty, bits_to_target, target_to_bits, targets_to_bits,
+)
+
+# Consensus parameters (mainnet)
+BLOCKS_PER_EPOCH = 2016
+TARGET_SPACING = 10 * 60
+TARGET_TIMESPAN = BLOCKS_PER_EPOCH * TARGET_SPACING  # 1,209,600 s = 2 weeks
+MAX_ADJUSTMENT = 4
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+# Kept under assets/ so a new export invalidates the cached scene sections
+HEADER_HISTORY_PATH = os.path.join(REPO_DIR, "assets", "block_headers.npz")
+
+# Serialized block header: 80 bytes, little endian
+HEADER_DTYPE = np.dtype([
+    ("version", "<i4"),
+    ("prev_block", "S32"),
+    ("merkle_root", "S32"),
+    ("time", "<u4"),
+    ("bits", "<u4"),
+    ("nonce", "<u4"),
+])
+
+
+#######################
+# Header history
+#######################
+def load_header_history(path=HEADER_HISTORY_PATH):
+    # (timestamps, bits) by height from one of:
+    #   .npz  arrays "timestamps" and "bits" (see save_header_history)
+    #   .csv  "timestamp,bits" rows, bits in hex or decimal
+    #   else  raw concatenated 80-byte headers, genesis first
+    # or a directory of blk*.dat files (see block_files.py)
+    if os.path.isdir(path):
+        from block_files import BlockFiles
+        return BlockFiles(path).header_history()
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return data["timestamps"].astype(np.int64), data["bits"].astype(np.uint32)
+    if path.endswith(".csv"):
+        rows = np.loadtxt(path, delimiter=",", dtype=str, comments="#", ndmin=2)
+        if not rows[0, 0].isdigit():
+            rows = rows[1:]  # header line
+        timestamps = rows[:, 0].astype(np.int64)
+        bits = np.array([int(value, 0) for value in rows[:, 1]], dtype=np.uint32)
+        return timestamps, bits
+    headers = np.fromfile(path, dtype=HEADER_DTYPE)
+    return headers["time"].astype(np.int64), headers["bits"].copy()
+
+
+def save_header_history(path, timestamps, bits):
+    np.savez_compressed(path, timestamps=np.asarray(timestamps, dtype=np.uint32),
+                        bits=np.asarray(bits, dtype=np.uint32))
+
+
+#######################
+# Retargeting
+#######################
+@dataclass
+class RetargetEpochs:
+    # One row per complete 2016-block epoch; the adjustment is the one made
+    # at its end, i.e. the nBits of the next epoch's first block
+    start_height: np.ndarray
+    start_time: np.ndarray
+    end_time: np.ndarray
+    actual_timespan: np.ndarray
+    clamped_timespan: np.ndarray
+    old_bits: np.ndarray
+    new_bits: np.ndarray
+    old_difficulty: np.ndarray
+    new_difficulty: np.ndarray
+    # Whether the history's next nBits is the computed one (None at the tip)
+    matches_chain: np.ndarray
+
+    def __len__(self):
+        return len(self.start_height)
+
+    @property
+    def end_height(self):
+        return self.start_height + BLOCKS_PER_EPOCH - 1
+
+    @property
+    def adjustment(self):
+        return self.new_difficulty / self.old_difficulty
+
+    def at_height(self, height):
+        return int(height) // BLOCKS_PER_EPOCH
+
+    def epoch(self, index):
+        return {
+            "epoch": int(index),
+            "start_height": int(self.start_height[index]),
+            "end_height": int(self.end_height[index]),
+            "start_time": int(self.start_time[index]),
+            "end_time": int(self.end_time[index]),
+            "actual_timespan": int(self.actual_timespan[index]),
+            "clamped_timespan": int(self.clamped_timespan[index]),
+            "old_bits": int(self.old_bits[index]),
+            "new_bits": int(self.new_bits[index]),
+            "old_difficulty": float(self.old_difficulty[index]),
+            "new_difficulty": float(self.new_difficulty[index]),
+            "adjustment": float(self.adjustment[index]),
+        }
+
+    def most_extreme(self, increase=True, min_difficulty=None):
+        # Epoch with the largest difficulty increase (or decrease)
+        adjustment = self.adjustment.copy()
+        if min_difficulty is not None:
+            adjustment[self.old_difficulty < min_difficulty] = np.nan
+        return int(np.nanargmax(adjustment) if increase else np.nanargmin(adjustment))
+
+
+def compute_retargets(timestamps, bits):
+    # Every epoch of the chain at once. Like Bitcoin Core, the timespan runs
+    # from the epoch's first block to its last, so it covers 2015 intervals.
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    bits = np.asarray(bits, dtype=np.uint32)
+    epochs = len(timestamps) // BLOCKS_PER_EPOCH
+    starts = np.arange(epochs, dtype=np.int64) * BLOCKS_PER_EPOCH
+    ends = starts + BLOCKS_PER_EPOCH - 1
+
+    actual = timestamps[ends] - timestamps[starts]
+    clamped = np.clip(actual, TARGET_TIMESPAN // MAX_ADJUSTMENT, TARGET_TIMESPAN * MAX_ADJUSTMENT)
+
+    # 256-bit arithmetic on Python ints, vectorized over epochs
+    old_targets = bits_to_target(bits[ends])
+    new_targets = old_targets * clamped.astype(object) // TARGET_TIMESPAN
+    new_targets = np.minimum(new_targets, POW_LIMIT)
+    new_bits = targets_to_bits(new_targets)
+
+    matches = np.full(epochs, None, dtype=object)
+    known = ends + 1 < len(bits)
+    matches[known] = bits[ends[known] + 1] == new_bits[known]
+
+    return RetargetEpochs(
+        start_height=starts,
+        start_time=timestamps[starts],
+        end_time=timestamps[ends],
+        actual_timespan=actual,
+        clamped_timespan=clamped,
+        old_bits=bits[ends],
+        new_bits=new_bits,
+        old_difficulty=bits_to_difficulty(bits[ends]),
+        new_difficulty=bits_to_difficulty(new_bits),
+        matches_chain=matches,
+    )
+
+
+def synthetic_header_history(epochs=420, seed=0, start_time=1231006505, growth=0.05, volatility=0.1):
+    # Header times and nBits for a chain whose hashrate follows a random
+    # walk with drift, retargeted by the consensus rule. Stands in for a
+    # real export when assets/block_headers.npz is missing.
+    rng = np.random.default_rng(seed)
+    timestamps = np.empty(epochs * BLOCKS_PER_EPOCH, dtype=np.int64)
+    bits = np.empty(epochs * BLOCKS_PER_EPOCH, dtype=np.uint32)
+    epoch_bits = POW_LIMIT_BITS
+    hashrate = 1.0  # in units of "difficulty 1 at one block per 10 minutes"
+    now = start_time
+    for epoch in range(epochs):
+        difficulty = float(bits_to_difficulty(epoch_bits)[0])
+        intervals = rng.exponential(TARGET_SPACING * difficulty / hashrate, BLOCKS_PER_EPOCH)
+        heights = slice(epoch * BLOCKS_PER_EPOCH, (epoch + 1) * BLOCKS_PER_EPOCH)
+        timestamps[heights] = now + np.cumsum(intervals).astype(np.int64)
+        bits[heights] = epoch_bits
+        now = int(timestamps[heights.stop - 1])
+
+        actual = timestamps[heights.stop - 1] - timestamps[heights.start]
+        clamped = min(max(actual, TARGET_TIMESPAN // MAX_ADJUSTMENT), TARGET_TIMESPAN * MAX_ADJUSTMENT)
+        target = min(int(bits_to_target(epoch_bits)[0]) * int(clamped) // TARGET_TIMESPAN, POW_LIMIT)
+        epoch_bits = target_to_bits(target)
+        hashrate *= float(np.exp(rng.normal(growth, volatility)))
+    return timestamps, bits
+
+
+def header_history(path=HEADER_HISTORY_PATH):
+    if os.path.exists(path):
+        return load_header_history(path)
+    return synthetic_header_history()
+
+
+if __name__ == "__main__":
+    # python retarget.py headers.bin --save assets/block_headers.npz
+    # python retarget.py --height 32256
+    parser = argparse.ArgumentParser(description="Recompute every difficulty adjustment of a header history")
+    parser.add_argument("path", nargs="?", default=HEADER_HISTORY_PATH,
+                        help="raw 80-byte headers, .csv or .npz (synthetic history if missing)")
+    parser.add_argument("--save", help="write the history as .npz for the scenes")
+    parser.add_argument("--height", type=int, help="print the epoch containing this height")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    timestamps, bits = header_history(args.path)
+    loaded = time.perf_counter()
+    epochs = compute_retargets(timestamps, bits)
+    computed = time.perf_counter()
+    print(f"Loaded {len(timestamps)} headers in {loaded - start:.3f}s, "
+          f"retargeted {len(epochs)} epochs in {computed - loaded:.3f}s")
+
+    known = np.array([match is not None for match in epochs.matches_chain])
+    mismatched = int(np.sum(epochs.matches_chain[known] == False))  # noqa: E712
+    print(f"{int(known.sum()) - mismatched}/{int(known.sum())} adjustments match the history's nBits")
+
+    if args.save:
+        save_header_history(args.save, timestamps, bits)
+        print(f"Saved {args.save}")
+
+    indices = [epochs.at_height(args.height)] if args.height is not None else [
+        epochs.most_extreme(increase=True), epochs.most_extreme(increase=False)]
+    for index in indices:
+        for key, value in epochs.epoch(index).items():
+            print(f"  {key:<18} {value:#x}" if key.endswith("bits") else f"  {key:<18} {value}")
+        print()
@@ -0,0 +1,166 @@
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from retarget import BLOCKS_PER_EPOCH, MAX_ADJUSTMENT, TARGET_SPACING, TARGET_TIMESPAN
+
+WEEK = 7 * 24 * 60 * 60
+
+
+#######################
+# Hashrate trajectories
+#######################
+# Hashrate is in units of difficulty: at hashrate H and difficulty D blocks
+# arrive every TARGET_SPACING * D / H seconds on average
+def constant_hashrate(epochs, hashrate=1.0):
+    return np.full(epochs, float(hashrate))
+
+
+def growing_hashrate(epochs, growth=0.02, hashrate=1.0):
+    # Compound growth per epoch (0.02 = 2% more hashrate every two weeks)
+    return hashrate * (1 + growth) ** np.arange(epochs)
+
+
+def hashrate_shock(epochs, at, factor, hashrate=1.0):
+    # A step change, e.g. factor=0.5 for half the miners switching off
+    trajectory = constant_hashrate(epochs, hashrate)
+    trajectory[at:] *= factor
+    return trajectory
+
+
+#######################
+# Monte Carlo retargeting
+#######################
+@dataclass
+class RetargetSimulation:
+    # Columns are (epochs, trials); row e describes epoch e
+    hashrate: np.ndarray
+    difficulty: np.ndarray
+    measured_timespan: np.ndarray
+    epoch_duration: np.ndarray
+
+    @property
+    def epochs(self):
+        return self.difficulty.shape[0]
+
+    @property
+    def trials(self):
+        return self.difficulty.shape[1]
+
+    @property
+    def mean_block_interval(self):
+        # Per trial, over the whole run
+        return self.epoch_duration.sum(axis=0) / (self.epochs * BLOCKS_PER_EPOCH)
+
+    def quantiles(self, column, q=(0.05, 0.5, 0.95)):
+        # Per-epoch spread of a column, shape (len(q), epochs)
+        return np.quantile(getattr(self, column), q, axis=1)
+
+
+def simulate_retargets(hashrate, trials=1000, initial_difficulty=None, seed=0,
+                       off_by_one=True, clamp=MAX_ADJUSTMENT):
+    # Run every trial through len(hashrate) epochs at once. A sum of n
+    # exponential inter-block times is Gamma(n), so an epoch costs two draws
+    # per trial instead of 2016:
+    #   measured span   2015 intervals, first block to last (Bitcoin's
+    #                   off-by-one; off_by_one=False measures all 2016)
+    #   epoch duration  the measured span plus the interval between the
+    #                   previous epoch's last block and this one's first
+    # Difficulty is kept as a float; nBits rounding (< 2^-15) is ignored.
+    hashrate = np.asarray(hashrate, dtype=np.float64)
+    epochs = len(hashrate)
+    rng = np.random.default_rng(seed)
+    measured_intervals = BLOCKS_PER_EPOCH - 1 if off_by_one else BLOCKS_PER_EPOCH
+
+    difficulty = np.empty((epochs, trials), dtype=np.float32)
+    measured = np.empty((epochs, trials), dtype=np.float32)
+    duration = np.empty((epochs, trials), dtype=np.float32)
+
+    current = np.full(trials, hashrate[0] if initial_difficulty is None else initial_difficulty, dtype=np.float64)
+    for epoch in range(epochs):
+        spacing = TARGET_SPACING * current / hashrate[epoch]
+        span = spacing * rng.standard_gamma(measured_intervals, trials)
+        gap = spacing * rng.standard_exponential(trials)
+
+        difficulty[epoch] = current
+        measured[epoch] = span
+        duration[epoch] = span + gap if off_by_one else span
+
+        clamped = np.clip(span, TARGET_TIMESPAN / clamp, TARGET_TIMESPAN * clamp)
+        current = current * TARGET_TIMESPAN / clamped
+
+    return RetargetSimulation(hashrate, difficulty, measured, duration)
+
+
+#######################
+# Hash grid scenarios
+#######################
+@dataclass
+class GridScenario:
+    # One run of the scene's hash grid: the slots in which a block was found,
+    # and the simulated epoch at this difficulty
+    valid_indices: list
+    epoch_weeks: float
+    adjustment: float
+
+
+def grid_hits(block_interval, slots, slot_seconds, trials, rng):
+    # (trials, slots): whether a block arrived during each slot of hashing
+    expected = slots * slot_seconds / block_interval
+    draws = int(expected + 6 * np.sqrt(expected) + 10)
+    arrivals = np.cumsum(rng.exponential(block_interval, (trials, draws)), axis=1)
+    slot = (arrivals // slot_seconds).astype(np.int64)
+    hits = np.zeros((trials, slots + 1), dtype=bool)
+    hits[np.arange(trials)[:, None], np.minimum(slot, slots)] = True
+    return hits[:, :slots]
+
+
+def grid_scenario(difficulty_ratio, slots=32, blocks_at_target=4, trials=1000, seed=0):
+    # The grid spans slots * slot_seconds of hashing, sized so the target
+    # difficulty finds `blocks_at_target` blocks on average. difficulty_ratio
+    # is difficulty over hashrate: 2.0 means blocks take twice as long.
+    rng = np.random.default_rng(seed)
+    slot_seconds = blocks_at_target * TARGET_SPACING / slots
+    block_interval = TARGET_SPACING * difficulty_ratio
+    hits = grid_hits(block_interval, slots, slot_seconds, trials, rng)
+
+    # The first trial that found the expected number of blocks, so the
+    # grid shows a typical outcome rather than an outlier
+    counts = hits.sum(axis=1)
+    expected = slots * slot_seconds / block_interval
+    trial = int(np.argmin(np.abs(counts - expected)))
+
+    epoch = simulate_retargets([1.0], trials, initial_difficulty=difficulty_ratio, seed=seed)
+    return GridScenario(
+        valid_indices=np.flatnonzero(hits[trial]).tolist(),
+        epoch_weeks=float(np.median(epoch.epoch_duration[0]) / WEEK),
+        adjustment=float(np.median(TARGET_TIMESPAN / np.clip(
+            epoch.measured_timespan[0], TARGET_TIMESPAN / MAX_ADJUSTMENT, TARGET_TIMESPAN * MAX_ADJUSTMENT))),
+    )
+
+
+if __name__ == "__main__":
+    # python retarget_simulation.py --epochs 10000 --trials 1000
+    parser = argparse.ArgumentParser(description="Monte Carlo block arrivals under Bitcoin's retarget rule")
+    parser.add_argument("--epochs", type=int, default=10000)
+    parser.add_argument("--trials", type=int, default=1000)
+    parser.add_argument("--growth", type=float, default=0.0, help="hashrate growth per epoch")
+    args = parser.parse_args()
+
+    trajectory = growing_hashrate(args.epochs, args.growth)
+    for off_by_one in (True, False):
+        start = time.perf_counter()
+        sim = simulate_retargets(trajectory, args.trials, off_by_one=off_by_one)
+        seconds = time.perf_counter() - start
+        print(
+            f"{'2015' if off_by_one else '2016'} measured intervals: {args.epochs} epochs x {args.trials} trials "
+            f"in {seconds:.2f}s, mean block interval {sim.mean_block_interval.mean():.2f}s "
+            f"(target {TARGET_SPACING}s)"
+        )
+
+    for ratio in (1.0, 2.0, 0.5):
+        scenario = grid_scenario(ratio)
+        print(f"difficulty/hashrate {ratio}: blocks in slots {scenario.valid_indices}, "
+              f"epoch {scenario.epoch_weeks:.2f} weeks, next difficulty x{scenario.adjustment:.2f}")
@@ -0,0 +1,308 @@
+import argparse
+import os
+import random
+import time
+
+# secp256k1 curve parameters: y^2 = x^3 + 7 over F_p
+P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+G = (
+    0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+    0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+)
+
+# The point at infinity (affine and Jacobian)
+INFINITY = None
+
+# Fixed-base table for G: WINDOWS windows of WINDOW_BITS bits each, with every
+# non-zero multiple j * 2^(WINDOW_BITS * i) * G stored in affine form. k*G is
+# then one mixed addition per non-zero byte of k and no doublings at all.
+WINDOW_BITS = 8
+WINDOWS = 256 // WINDOW_BITS
+WINDOW_SIZE = (1 << WINDOW_BITS) - 1
+
+TABLE_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", f"secp256k1_g{WINDOW_BITS}.bin"
+)
+
+
+#######################
+# Jacobian coordinates: (X, Y, Z) stands for the affine point (X/Z^2, Y/Z^3)
+#######################
+def to_jacobian(point):
+    if point is INFINITY:
+        return INFINITY
+    return point[0], point[1], 1
+
+
+def jacobian_double(p1):
+    if p1 is INFINITY:
+        return INFINITY
+    x1, y1, z1 = p1
+    if y1 == 0:
+        return INFINITY
+
+    yy = y1 * y1 % P
+    s = 4 * x1 * yy % P
+    m = 3 * x1 * x1 % P
+    x3 = (m * m - 2 * s) % P
+    y3 = (m * (s - x3) - 8 * yy * yy) % P
+    z3 = 2 * y1 * z1 % P
+    return x3, y3, z3
+
+
+def jacobian_add_affine(p1, q):
+    # Mixed addition: Jacobian p1 + affine q (q has an implicit Z of 1)
+    if q is INFINITY:
+        return p1
+    if p1 is INFINITY:
+        return to_jacobian(q)
+
+    x1, y1, z1 = p1
+    x2, y2 = q
+    zz = z1 * z1 % P
+    u2 = x2 * zz % P
+    s2 = y2 * zz * z1 % P
+    h = (u2 - x1) % P
+    r = (s2 - y1) % P
+    if h == 0:
+        return jacobian_double(p1) if r == 0 else INFINITY
+
+    hh = h * h % P
+    hhh = h * hh % P
+    v = x1 * hh % P
+    x3 = (r * r - hhh - 2 * v) % P
+    y3 = (r * (v - x3) - y1 * hhh) % P
+    z3 = z1 * h % P
+    return x3, y3, z3
+
+
+def jacobian_add(p1, p2):
+    if p1 is INFINITY:
+        return p2
+    if p2 is INFINITY:
+        return p1
+
+    x1, y1, z1 = p1
+    x2, y2, z2 = p2
+    z1z1 = z1 * z1 % P
+    z2z2 = z2 * z2 % P
+    u1 = x1 * z2z2 % P
+    u2 = x2 * z1z1 % P
+    s1 = y1 * z2z2 * z2 % P
+    s2 = y2 * z1z1 * z1 % P
+    h = (u2 - u1) % P
+    r = (s2 - s1) % P
+    if h == 0:
+        return jacobian_double(p1) if r == 0 else INFINITY
+
+    hh = h * h % P
+    hhh = h * hh % P
+    v = u1 * hh % P
+    x3 = (r * r - hhh - 2 * v) % P
+    y3 = (r * (v - x3) - s1 * hhh) % P
+    z3 = z1 * z2 * h % P
+    return x3, y3, z3
+
+
+def to_affine(p1):
+    if p1 is INFINITY:
+        return INFINITY
+    x, y, z = p1
+    z_inv = pow(z, -1, P)
+    zz_inv = z_inv * z_inv % P
+    return x * zz_inv % P, y * zz_inv * z_inv % P
+
+
+def batch_to_affine(points):
+    # Montgomery's trick: one modular inversion for the whole batch plus three
+    # multiplications per point, instead of one inversion per point
+    prefix = []
+    acc = 1
+    for p1 in points:
+        prefix.append(acc)
+        if p1 is not INFINITY:
+            acc = acc * p1[2] % P
+
+    acc_inv = pow(acc, -1, P)
+    result = [INFINITY] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        p1 = points[i]
+        if p1 is INFINITY:
+            continue
+        x, y, z = p1
+        z_inv = acc_inv * prefix[i] % P
+        acc_inv = acc_inv * z % P
+        zz_inv = z_inv * z_inv % P
+        result[i] = (x * zz_inv % P, y * zz_inv * z_inv % P)
+    return result
+
+
+#######################
+# Precomputed generator table
+#######################
+def _build_generator_table():
+    table = []
+    base = to_jacobian(G)
+    for _ in range(WINDOWS):
+        multiples = [base]
+        for _ in range(WINDOW_SIZE - 1):
+            multiples.append(jacobian_add(multiples[-1], base))
+        table.append(batch_to_affine(multiples))
+        # Next window's base is 2^WINDOW_BITS times this one
+        for _ in range(WINDOW_BITS):
+            base = jacobian_double(base)
+    return table
+
+
+def _save_generator_table(table, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        for window in table:
+            for x, y in window:
+                f.write(x.to_bytes(32, "big") + y.to_bytes(32, "big"))
+    os.replace(tmp_path, path)
+
+
+def _load_generator_table(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) != WINDOWS * WINDOW_SIZE * 64:
+        return None
+
+    points = [
+        (int.from_bytes(data[i:i + 32], "big"), int.from_bytes(data[i + 32:i + 64], "big"))
+        for i in range(0, len(data), 64)
+    ]
+    table = [points[i:i + WINDOW_SIZE] for i in range(0, len(points), WINDOW_SIZE)]
+    # Cheap sanity check against a stale or corrupted file
+    if table[0][0] != G or table[0][1] != to_affine(jacobian_double(to_jacobian(G))):
+        return None
+    return table
+
+
+_generator_table = None
+
+
+def generator_table():
+    # Built once per process; loaded from the disk cache when available
+    global _generator_table
+    if _generator_table is None:
+        table = None
+        if os.path.exists(TABLE_CACHE_PATH):
+            table = _load_generator_table(TABLE_CACHE_PATH)
+        if table is None:
+            table = _build_generator_table()
+            try:
+                _save_generator_table(table, TABLE_CACHE_PATH)
+            except OSError:
+                pass
+        _generator_table = table
+    return _generator_table
+
+
+def generator_multiple(k):
+    # k*G in Jacobian coordinates using the fixed-base table
+    table = generator_table()
+    k %= N
+    result = INFINITY
+    window = 0
+    while k:
+        digit = k & WINDOW_SIZE
+        if digit:
+            result = jacobian_add_affine(result, table[window][digit - 1])
+        k >>= WINDOW_BITS
+        window += 1
+    return result
+
+
+#######################
+# Affine API
+#######################
+def point_add(p1, p2):
+    return to_affine(jacobian_add(to_jacobian(p1), to_jacobian(p2)))
+
+
+def point_mul(k, point=G):
+    if point == G:
+        return to_affine(generator_multiple(k))
+
+    # Variable base: left-to-right double-and-add in Jacobian coordinates
+    k %= N
+    result = INFINITY
+    for bit in range(k.bit_length() - 1, -1, -1):
+        result = jacobian_double(result)
+        if (k >> bit) & 1:
+            result = jacobian_add_affine(result, point)
+    return to_affine(result)
+
+
+def pubkey_from_private(k):
+    if not 0 < k < N:
+        raise ValueError("Private key must be in the range 1..n-1")
+    return to_affine(generator_multiple(k))
+
+
+def batch_pubkeys(private_keys):
+    # Many k*G at once: table lookups per key, then one shared inversion
+    for k in private_keys:
+        if not 0 < k < N:
+            raise ValueError("Private key must be in the range 1..n-1")
+    return batch_to_affine([generator_multiple(k) for k in private_keys])
+
+
+def serialize_point(point):
+    # 33-byte SEC1 compressed encoding
+    x, y = point
+    return bytes([2 + (y & 1)]) + x.to_bytes(32, "big")
+
+
+def parse_point(data):
+    # Decode a 33-byte compressed point, recovering y from x
+    if len(data) != 33 or data[0] not in (2, 3):
+        raise ValueError("Expected a 33-byte compressed public key")
+    x = int.from_bytes(data[1:], "big")
+    if x >= P:
+        raise ValueError("Public key x coordinate is not in the field")
+
+    y = pow((pow(x, 3, P) + 7) % P, (P + 1) // 4, P)
+    if (y * y - x * x * x - 7) % P:
+        raise ValueError("Public key is not on the curve")
+    if (y & 1) != (data[0] & 1):
+        y = P - y
+    return x, y
+
+
+def benchmark(count=10000, seed=0):
+    # Pubkeys per second for a batch of random private keys
+    rng = random.Random(seed)
+    private_keys = [rng.randrange(1, N) for _ in range(count)]
+
+    start = time.perf_counter()
+    generator_table()
+    table_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_pubkeys(private_keys)
+    elapsed = time.perf_counter() - start
+    return {
+        "keys": count,
+        "table_seconds": table_seconds,
+        "seconds": elapsed,
+        "pubkeys_per_second": count / elapsed,
+    }
+
+
+if __name__ == "__main__":
+    # Benchmark: python secp256k1.py --count 10000
+    parser = argparse.ArgumentParser(description="Benchmark batched secp256k1 public key derivation")
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args()
+
+    result = benchmark(args.count)
+    print(
+        f"G table ready in {result['table_seconds']:.2f}s; "
+        f"{result['keys']} pubkeys in {result['seconds']:.2f}s: "
+        f"{result['pubkeys_per_second']:.0f} pubkeys/s"
+    )
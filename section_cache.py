@@ -0,0 +1,275 @@
+import ast
+import functools
+import hashlib
+import inspect
+import json
+import os
+import random
+import shutil
+import textwrap
+
+import numpy as np
+from manim import Mobject, VMobject, config, logger
+
+# One directory per rendered section: its partial movies plus a manifest.
+# render_benchmark.py points SECTION_CACHE_DIR at a scratch directory.
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SECTION_CACHE_DIR = os.environ.get("SECTION_CACHE_DIR") or os.path.join(REPO_DIR, ".cache", "sections")
+ASSETS_DIR = os.path.join(REPO_DIR, "assets")
+
+# Set by parallel_render.py: render only this section, fast-forward the rest
+RENDER_ONLY_ENV = "SECTION_CACHE_RENDER_ONLY"
+
+# Output settings that change the pixels of a partial movie
+QUALITY_KEYS = (
+    "pixel_width", "pixel_height", "frame_rate", "background_color",
+    "background_opacity", "transparent", "movie_file_extension",
+)
+
+
+def mobject_digest(mobjects, h):
+    # Everything that is drawn: the points and colours of each family member
+    for mob in mobjects:
+        for sub in mob.get_family():
+            h.update(type(sub).__name__.encode())
+            h.update(np.ascontiguousarray(sub.points).tobytes())
+            if isinstance(sub, VMobject):
+                h.update(np.ascontiguousarray(sub.get_fill_rgbas()).tobytes())
+                h.update(np.ascontiguousarray(sub.get_stroke_rgbas()).tobytes())
+                h.update(repr(sub.get_stroke_width()).encode())
+            pixels = getattr(sub, "pixel_array", None)
+            if pixels is not None:
+                h.update(np.ascontiguousarray(pixels).tobytes())
+
+
+def _value_digest(value, h):
+    if isinstance(value, Mobject):
+        mobject_digest([value], h)
+    elif isinstance(value, (list, tuple)) and all(isinstance(v, Mobject) for v in value):
+        mobject_digest(value, h)
+    else:
+        h.update(repr(value).encode())
+
+
+def _code_names(code):
+    # Global names a function (and any lambda or comprehension inside it) uses
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+
+def _is_local(module):
+    path = getattr(module, "__file__", None)
+    return bool(path) and os.path.dirname(os.path.abspath(path)) == REPO_DIR
+
+
+def _local_module_closure(modules):
+    # Repo modules plus the repo modules they import, by name
+    found = {}
+    pending = list(modules)
+    while pending:
+        module = pending.pop()
+        if module.__name__ in found or not _is_local(module):
+            continue
+        found[module.__name__] = module
+        for value in list(vars(module).values()):
+            dependency = value if inspect.ismodule(value) else inspect.getmodule(value)
+            if dependency is not None:
+                pending.append(dependency)
+    return found
+
+
+def section_dependencies(cls, method):
+    # What a section's output depends on besides its entry state: its source,
+    # the self.<helper>() methods it reaches, the globals they read from their
+    # own module, and the repo modules (engines, caches, ...) they call into.
+    # Keyed by content, not by file, so two scene files that share a section
+    # module share its renders.
+    seen, parts, modules = set(), [], []
+    pending = [method]
+    while pending:
+        func = inspect.unwrap(pending.pop())
+        if func in seen:
+            continue
+        seen.add(func)
+        source = textwrap.dedent(inspect.getsource(func))
+        parts.append(source)
+
+        for node in ast.walk(ast.parse(source)):
+            if (
+                isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id == "self"
+            ):
+                helper = inspect.getattr_static(cls, node.attr, None)
+                if inspect.isfunction(helper) and not getattr(helper, "__section__", False):
+                    pending.append(helper)
+
+        namespace = func.__globals__
+        for name in sorted(_code_names(func.__code__)):
+            if name not in namespace:
+                continue
+            value = namespace[name]
+            module = value if inspect.ismodule(value) else inspect.getmodule(value)
+            if module is not None and module.__name__ != func.__module__:
+                modules.append(module)
+            elif inspect.isfunction(value):
+                pending.append(value)
+            elif inspect.isclass(value):
+                parts.append(inspect.getsource(value))
+            else:
+                parts.append(f"{name} = {value!r}")
+
+    for name, module in sorted(_local_module_closure(modules).items()):
+        with open(module.__file__, encoding="utf-8") as f:
+            parts.append(f"# {name}\n{f.read()}")
+    return sorted(parts)
+
+
+def assets_digest(h):
+    if not os.path.isdir(ASSETS_DIR):
+        return
+    for name in sorted(os.listdir(ASSETS_DIR)):
+        with open(os.path.join(ASSETS_DIR, name), "rb") as f:
+            h.update(name.encode())
+            h.update(f.read())
+
+
+def section_names(scene_class):
+    # The @cached_section methods construct() calls, in call order
+    source = textwrap.dedent(inspect.getsource(scene_class.construct))
+    names = []
+    for node in ast.walk(ast.parse(source)):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "self"
+            and getattr(getattr(scene_class, node.func.attr, None), "__section__", False)
+        ):
+            names.append((node.lineno, node.col_offset, node.func.attr))
+    return [name for _, _, name in sorted(names)]
+
+
+def cached_section(*inputs):
+    # Mark a sceneN_* method as a cached section. `inputs` names the scene
+    # attributes the section reads on entry besides what is on screen, e.g.
+    # @cached_section("non_deterministic_title").
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return self.run_section(method, inputs, args, kwargs)
+
+        wrapper.__section__ = True
+        return wrapper
+
+    return decorate
+
+
+class SectionCacheMixin:
+    # Mixed into a Scene whose construct() calls @cached_section methods.
+    # An unchanged section still runs (so the scene state it leaves behind is
+    # right) but with animations skipped, and its stored partial movies are
+    # spliced into the final concat in place of the skipped ones.
+
+    # Sections are only reusable if the randomness they draw is repeatable
+    section_seed = 0
+
+    def setup(self):
+        super().setup()
+        self._sections_to_store = []
+        if self.section_seed is not None:
+            random.seed(self.section_seed)
+            np.random.seed(self.section_seed)
+
+    def section_key(self, method, inputs, args, kwargs):
+        h = hashlib.sha256()
+        h.update(method.__qualname__.encode())
+        for part in section_dependencies(type(self), method):
+            h.update(part.encode())
+        h.update(repr((args, sorted(kwargs.items()))).encode())
+        for name in inputs:
+            h.update(name.encode())
+            _value_digest(getattr(self, name, None), h)
+
+        # Entry state: what is on screen, where the camera is, the RNGs
+        mobject_digest(self.mobjects, h)
+        frame = getattr(self.camera, "frame", None)
+        if frame is not None:
+            mobject_digest([frame], h)
+        h.update(repr(random.getstate()).encode())
+        h.update(repr(np.random.get_state(legacy=False)).encode())
+
+        h.update(json.dumps({name: repr(config.get(name)) for name in QUALITY_KEYS}).encode())
+        h.update(repr(getattr(self, "static_hold_mode", None)).encode())
+        assets_digest(h)
+        return h.hexdigest()
+
+    def run_section(self, method, inputs, args, kwargs):
+        writer = self.renderer.file_writer
+        if not writer.output_spec.is_video:
+            self.next_section(method.__name__)
+            return method(self, *args, **kwargs)
+
+        only = os.environ.get(RENDER_ONLY_ENV)
+        if only and only != method.__name__:
+            # Another process renders this one; just rebuild its end state
+            self.next_section(method.__name__, skip_animations=True)
+            return method(self, *args, **kwargs)
+
+        key = self.section_key(method, inputs, args, kwargs)
+        directory = os.path.join(SECTION_CACHE_DIR, key)
+        manifest_path = os.path.join(directory, "manifest.json")
+        cached = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                cached = [os.path.join(directory, name) for name in json.load(f)["files"]]
+
+        self.next_section(method.__name__, skip_animations=cached is not None)
+        section = writer.sections[-1]
+        start = len(writer.partial_movie_files)
+        result = method(self, *args, **kwargs)
+        end = len(writer.partial_movie_files)
+
+        if cached is None:
+            self._sections_to_store.append((method.__name__, key, start, end))
+        elif len(cached) != end - start:
+            raise RuntimeError(
+                f"Section cache entry {directory} holds {len(cached)} movies but "
+                f"{method.__name__} played {end - start}; delete it and re-render"
+            )
+        else:
+            logger.info(f"Section {method.__name__}: reusing cached render {key[:12]}")
+            writer.partial_movie_files[start:end] = cached
+            section.partial_movie_files[:] = cached
+        return result
+
+    def tear_down(self):
+        super().tear_down()
+        writer = self.renderer.file_writer
+        if not self._sections_to_store:
+            return
+        # Partial movies are encoded in the background; wait for them to land
+        writer.join_all_encode_jobs()
+
+        for name, key, start, end in self._sections_to_store:
+            files = writer.partial_movie_files[start:end]
+            if not files or None in files:
+                # Part of the section was skipped (-n, -s, ...), nothing to keep
+                continue
+            directory = os.path.join(SECTION_CACHE_DIR, key)
+            staging = f"{directory}.{os.getpid()}.tmp"
+            os.makedirs(staging, exist_ok=True)
+            names = []
+            for i, path in enumerate(files):
+                names.append(f"{i:05d}{os.path.splitext(path)[1]}")
+                shutil.copyfile(path, os.path.join(staging, names[-1]))
+            with open(os.path.join(staging, "manifest.json"), "w") as f:
+                json.dump({"section": name, "files": names}, f)
+            if os.path.exists(directory):
+                shutil.rmtree(staging)
+            else:
+                os.replace(staging, directory)
+        self._sections_to_store = []
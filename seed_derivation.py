@@ -0,0 +1,145 @@
+import argparse
+import hashlib
+import itertools
+import os
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from mnemonic_engine import batch_entropy_to_mnemonics, random_entropy_batch
+
+# BIP-39 seed stretching: PBKDF2-HMAC-SHA512, 2048 rounds, 64-byte seed
+PBKDF2_ROUNDS = 2048
+SEED_BYTES = 64
+
+# HMAC inner/outer pad translation tables
+_IPAD = bytes(x ^ 0x36 for x in range(256))
+_OPAD = bytes(x ^ 0x5C for x in range(256))
+
+
+def normalize(text):
+    # BIP-39 requires NFKD normalization of both the mnemonic and the passphrase
+    return unicodedata.normalize("NFKD", text)
+
+
+def seed_password_and_salt(mnemonic, passphrase=""):
+    # The mnemonic sentence is the password, "mnemonic" + passphrase is the salt
+    if not isinstance(mnemonic, str):
+        mnemonic = " ".join(mnemonic)
+    password = normalize(mnemonic).encode("utf-8")
+    salt = ("mnemonic" + normalize(passphrase)).encode("utf-8")
+    return password, salt
+
+
+def mnemonic_to_seed(mnemonic, passphrase=""):
+    password, salt = seed_password_and_salt(mnemonic, passphrase)
+    return hashlib.pbkdf2_hmac("sha512", password, salt, PBKDF2_ROUNDS, SEED_BYTES)
+
+
+def _derive_pair(pair):
+    mnemonic, passphrase = pair
+    return mnemonic_to_seed(mnemonic, passphrase)
+
+
+def derive_seeds(pairs, max_workers=None, chunksize=32):
+    # Fan (mnemonic, passphrase) pairs out over one process per core and
+    # stream the seeds back in input order
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1:
+        for pair in pairs:
+            yield _derive_pair(pair)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_derive_pair, pairs, chunksize=chunksize)
+
+
+@dataclass(frozen=True)
+class PBKDF2Round:
+    # One PBKDF2 iteration: U_i = HMAC(password, U_{i-1}) and the running XOR T
+    number: int
+    u: bytes
+    t: bytes
+
+
+def _hmac_pad_states(key, hash_name="sha512"):
+    # Hash the key-xor-ipad and key-xor-opad blocks once; every HMAC call after
+    # that copies these states, so one round is two compressions instead of four
+    block_size = hashlib.new(hash_name).block_size
+    if len(key) > block_size:
+        key = hashlib.new(hash_name, key).digest()
+    key = key.ljust(block_size, b"\0")
+    return hashlib.new(hash_name, key.translate(_IPAD)), hashlib.new(hash_name, key.translate(_OPAD))
+
+
+def iter_pbkdf2_rounds(password, salt, iterations=PBKDF2_ROUNDS, hash_name="sha512"):
+    # Lazily yield every round of the first PBKDF2 output block. For SHA-512 that
+    # block is the whole 64-byte BIP-39 seed, and the last round's t is the seed.
+    inner, outer = _hmac_pad_states(password, hash_name)
+
+    def prf(message):
+        inner_hash = inner.copy()
+        inner_hash.update(message)
+        outer_hash = outer.copy()
+        outer_hash.update(inner_hash.digest())
+        return outer_hash.digest()
+
+    u = prf(salt + (1).to_bytes(4, "big"))
+    t = int.from_bytes(u, "big")
+    yield PBKDF2Round(1, u, u)
+
+    for number in range(2, iterations + 1):
+        u = prf(u)
+        t ^= int.from_bytes(u, "big")
+        yield PBKDF2Round(number, u, t.to_bytes(len(u), "big"))
+
+
+def trace_mnemonic_seed(mnemonic, passphrase=""):
+    # The 2048 HMAC-SHA512 rounds that turn a mnemonic into its seed
+    password, salt = seed_password_and_salt(mnemonic, passphrase)
+    return iter_pbkdf2_rounds(password, salt)
+
+
+def sample_rounds(mnemonic, passphrase="", numbers=(1, 2, 3, PBKDF2_ROUNDS)):
+    # Keep only the rounds a scene actually shows, e.g. the first few and the
+    # last. Rounds past the highest wanted number are never computed.
+    wanted = set(numbers)
+    rounds = itertools.islice(trace_mnemonic_seed(mnemonic, passphrase), max(wanted, default=0))
+    return [r for r in rounds if r.number in wanted]
+
+
+def benchmark(count=2000, max_workers=None, passphrase=""):
+    # Time seed derivation for random 12-word mnemonics
+    workers = max_workers or os.cpu_count() or 1
+    batch = batch_entropy_to_mnemonics(random_entropy_batch(count))
+    pairs = [(" ".join(words), passphrase) for words in batch.words]
+
+    start = time.perf_counter()
+    for _ in derive_seeds(pairs, max_workers=workers):
+        pass
+    elapsed = time.perf_counter() - start
+
+    seeds_per_second = count / elapsed
+    return {
+        "seeds": count,
+        "workers": workers,
+        "seconds": elapsed,
+        "seeds_per_second": seeds_per_second,
+        "seeds_per_second_per_core": seeds_per_second / workers,
+    }
+
+
+if __name__ == "__main__":
+    # Benchmark: python seed_derivation.py --count 5000 --workers 8
+    parser = argparse.ArgumentParser(description="Benchmark BIP-39 mnemonic -> seed derivation")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    result = benchmark(args.count, args.workers)
+    print(
+        f"{result['seeds']} seeds on {result['workers']} cores in {result['seconds']:.2f}s: "
+        f"{result['seeds_per_second']:.0f} seeds/s, "
+        f"{result['seeds_per_second_per_core']:.0f} seeds/s per core"
+    )
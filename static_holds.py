@@ -0,0 +1,75 @@
+from fractions import Fraction
+
+import av
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.scene.video_segment_encoder import VideoSegmentEncoder
+
+# manim already rasterizes a static self.wait() once and hands the encoder
+# that frame with repeat=N; these classes make the N copies cheap as well.
+#
+# "still":  encode the frame at the first and last timestamp of the hold only.
+#           The segment keeps its exact duration but has variable frame rate.
+# "repeat": convert the frame to the stream's pixel format once and encode it
+#           N times, for outputs that must stay constant frame rate.
+HOLD_MODES = ("still", "repeat")
+
+
+class StaticHoldSegmentEncoder(VideoSegmentEncoder):
+    def __init__(self, *, target, spec, hold_mode="still"):
+        if hold_mode not in HOLD_MODES:
+            raise ValueError(f"Unknown hold mode {hold_mode!r}, expected one of {HOLD_MODES}")
+        super().__init__(target=target, spec=spec)
+        self.hold_mode = hold_mode
+
+    def write_frame(self, pixels, *, repeat=1):
+        if repeat == 1:
+            return super().write_frame(pixels, repeat=1)
+
+        self._validate_frame(pixels, repeat)
+        frame = av.VideoFrame.from_ndarray(pixels, format="rgba").reformat(format=self.spec.pixel_format)
+        frame.time_base = Fraction(self.spec.frame_rate.denominator, self.spec.frame_rate.numerator)
+        if self.hold_mode == "still":
+            timestamps = (self._next_pts, self._next_pts + repeat - 1)
+        else:
+            timestamps = range(self._next_pts, self._next_pts + repeat)
+        try:
+            for pts in timestamps:
+                frame.pts = pts
+                for packet in self._stream.encode(frame):
+                    self._container.mux(packet)
+        except BaseException as error:
+            raise self._operation_error("encode", error) from error
+        self._next_pts += repeat
+
+
+class StaticHoldFileWriter(SceneFileWriter):
+    hold_mode = "still"
+
+    # Segments are cached by play hash; tag the hash with the hold mode so a
+    # still-mode segment is never reused by a constant-frame-rate render
+    def add_partial_movie_file(self, hash_animation):
+        if hash_animation is not None:
+            hash_animation = f"{hash_animation}_{self.hold_mode}"
+        super().add_partial_movie_file(hash_animation)
+
+    def is_already_cached(self, hash_invocation):
+        return super().is_already_cached(f"{hash_invocation}_{self.hold_mode}")
+
+    def _create_segment_encoder(self, target):
+        return StaticHoldSegmentEncoder(target=target, spec=self.video_encoder, hold_mode=self.hold_mode)
+
+
+class StaticHoldMixin:
+    # Mixed into a Scene so its waits and other frozen frames are encoded as
+    # holds. Set static_hold_mode = "repeat" for constant-frame-rate output.
+    static_hold_mode = "still"
+
+    def setup(self):
+        super().setup()
+        renderer = self.renderer
+        if isinstance(renderer, CairoRenderer) and renderer.file_writer.output_spec.is_video:
+            # Nothing has been played yet, so the writer can be swapped whole
+            writer = StaticHoldFileWriter(self.file_writer_settings)
+            writer.hold_mode = self.static_hold_mode
+            renderer.file_writer = writer
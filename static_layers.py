@@ -0,0 +1,162 @@
+import weakref
+
+import numpy as np
+from manim import AnimationGroup, DrawBorderThenFill, ShowPartial, Transform
+from manim.utils.family import extract_mobject_family_members
+
+
+def _bounding_box(mob):
+    points = mob.points[:, :2]
+    return np.concatenate([points.min(axis=0), points.max(axis=0)])
+
+
+# Where a mobject whose path through the play is unknown may end up
+_ANYWHERE = np.array([-np.inf, -np.inf, np.inf, np.inf])
+
+
+def _union(a, b):
+    return np.concatenate([np.minimum(a[:2], b[:2]), np.maximum(a[2:], b[2:])])
+
+
+def _overlaps(box, boxes):
+    # box (x0, y0, x1, y1) against each row of boxes
+    return ((boxes[:, 0] < box[2]) & (box[0] < boxes[:, 2])
+            & (boxes[:, 1] < box[3]) & (box[1] < boxes[:, 3]))
+
+
+class StaticLayerMixin:
+    # Mixed into a Scene to shrink the set of mobjects redrawn on every frame.
+    # manim rasterizes everything drawn before the first moving mobject once
+    # per play, but it treats a whole group as moving as soon as one of its
+    # children animates. That puts a 32-square grid, or a container grouped
+    # with the bits inside it, back into the per-frame set. Here only mobjects
+    # that can actually change are moving, and mobjects passed to
+    # mark_static() are treated as backdrops: while they are not animated
+    # themselves they go into the cached background, even if they were added
+    # after something that moves. A backdrop only moves there when nothing
+    # drawn beneath it can overlap it at any point of the play, so the
+    # layering on screen never changes.
+
+    def setup(self):
+        super().setup()
+        # Weak, so a removed backdrop's id can't be mistaken for a new mobject
+        self._static_layer = weakref.WeakSet()
+
+    def mark_static(self, *mobjects):
+        # Backdrops (containers, boxes, grids) that nothing moving passes
+        # underneath; overlays drawn on top of moving mobjects stay unmarked
+        for mob in mobjects:
+            self._static_layer.update(mob.get_family())
+
+    def unmark_static(self, *mobjects):
+        for mob in mobjects:
+            self._static_layer.difference_update(mob.get_family())
+
+    def _changing_mobjects(self, animations):
+        # ids of every family member an animation, updater or the foreground
+        # can change; an updater on a group can change all its children
+        changing = set()
+        pending = list(animations)
+        while pending:
+            anim = pending.pop()
+            changing.update(id(sub) for sub in anim.mobject.get_family())
+            if isinstance(anim, AnimationGroup):
+                pending.extend(anim.animations)
+        for mob in self.get_mobject_family_members():
+            if mob.updaters or mob in self.foreground_mobjects:
+                changing.update(id(sub) for sub in mob.get_family())
+        return changing
+
+    def _camera_moving(self, changing):
+        # A MovingCameraScene's frame is animated like any mobject; while it
+        # moves, every pixel on screen changes
+        camera = self.renderer.camera
+        if not hasattr(camera, "get_mobjects_indicating_movement"):
+            return False
+        return any(
+            id(sub) in changing
+            for mob in camera.get_mobjects_indicating_movement()
+            for sub in mob.get_family()
+        )
+
+    def _reach(self, animations):
+        # id -> box a changing mobject can cover during the play. A straight
+        # Transform moves each point from its start to its end, and Create or
+        # Write only draw part of the final shape, so those stay inside their
+        # start and end boxes; anything else changing may go anywhere.
+        reach = {}
+        pending = list(animations)
+        while pending:
+            anim = pending.pop()
+            if isinstance(anim, AnimationGroup):
+                pending.extend(anim.animations)
+                continue
+            family = anim.mobject.get_family()
+            start = getattr(anim, "starting_mobject", None)
+            target = getattr(anim, "target_copy", None)
+            if isinstance(anim, Transform) and not anim.path_arc and start is not None and target is not None:
+                ends = zip(start.get_family(), target.get_family())
+            elif isinstance(anim, (ShowPartial, DrawBorderThenFill)) and start is not None:
+                ends = ((sub, sub) for sub in start.get_family())
+            else:
+                reach.update((id(sub), _ANYWHERE) for sub in family)
+                continue
+            for sub, (first, last) in zip(family, ends):
+                boxes = [_bounding_box(end) for end in (first, last) if end.has_points()]
+                box = _union(*boxes) if len(boxes) == 2 else boxes[0] if boxes else None
+                if box is not None:
+                    reach[id(sub)] = _union(reach[id(sub)], box) if id(sub) in reach else box
+        for mob in self.get_mobject_family_members():
+            if mob.updaters or mob in self.foreground_mobjects:
+                reach.update((id(sub), _ANYWHERE) for sub in mob.get_family())
+        return reach
+
+    def get_moving_mobjects(self, *animations):
+        # Same rule as manim (everything drawn after the first changing
+        # mobject moves), but an untouched parent no longer drags its
+        # earlier children along with it
+        changing = self._changing_mobjects(animations)
+        mobjects = self.get_mobject_family_members()
+        if self._camera_moving(changing):
+            return mobjects
+        for i, mob in enumerate(mobjects):
+            if id(mob) in changing:
+                return mobjects[i:]
+        return []
+
+    def get_moving_and_static_mobjects(self, animations):
+        moving, static = super().get_moving_and_static_mobjects(animations)
+        if not self._static_layer:
+            return moving, static
+
+        changing = self._changing_mobjects(animations)
+        if self._camera_moving(changing):
+            return moving, static
+        # A backdrop drawn over a moving mobject that overlaps it at any point
+        # of the play (a translucent highlight over animated text, or text
+        # sliding under a box) has to be redrawn on top of it
+        reach = self._reach(animations)
+        backdrop = set()
+        below = np.empty((0, 4))
+        for mob in moving:
+            if not mob.has_points():
+                continue
+            if mob in self._static_layer and id(mob) not in changing:
+                if not _overlaps(_bounding_box(mob), below).any():
+                    backdrop.add(id(mob))
+                    continue
+            box = reach.get(id(mob), _ANYWHERE) if id(mob) in changing else _bounding_box(mob)
+            below = np.vstack([below, box])
+        if not backdrop:
+            return moving, static
+
+        # Keep drawing order within each layer
+        all_mobjects = extract_mobject_family_members(
+            self.mobjects + [m for m in self.foreground_mobjects if m not in self.mobjects],
+            use_z_index=self.renderer.camera.use_z_index,
+            only_those_with_points=True,
+        )
+        moving = [mob for mob in moving if id(mob) not in backdrop]
+        moving_ids = {id(mob) for mob in moving}
+        static = [mob for mob in all_mobjects if id(mob) not in moving_ids]
+        return moving, static
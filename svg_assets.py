@@ -0,0 +1,55 @@
+import contextlib
+import hashlib
+import json
+import os
+
+import manim
+from manim import SVGMobject
+
+from text_cache import CACHE_READ_ERRORS, load_vmobject, save_vmobject
+
+# Tessellated SVG outlines, one .npz per (file contents, SVGMobject arguments)
+SVG_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "svg")
+
+# (absolute path, arguments) -> parsed template; copies are handed out from here
+_registry = {}
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def svg_key(path, kwargs):
+    payload = {
+        "svg": file_digest(path),
+        "kwargs": {name: repr(value) for name, value in sorted(kwargs.items())},
+        "manim": manim.__version__,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def svg_asset(path, **kwargs):
+    # A fresh copy of the SVG at `path`. The file is read and hashed once per
+    # process and only parsed by SVGMobject when its contents change.
+    registry_key = (os.path.abspath(path), tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+    template = _registry.get(registry_key)
+    if template is None:
+        cache_path = os.path.join(SVG_CACHE_DIR, f"{svg_key(path, kwargs)}.npz")
+        if os.path.exists(cache_path):
+            try:
+                template = load_vmobject(cache_path)
+            except CACHE_READ_ERRORS:
+                # Corrupt entry (e.g. an interrupted write): drop it and reparse
+                with contextlib.suppress(OSError):
+                    os.remove(cache_path)
+        if template is None:
+            template = SVGMobject(path, **kwargs)
+            try:
+                save_vmobject(template, cache_path)
+                template = load_vmobject(cache_path)
+            except OSError:
+                # Unwritable cache: use the parsed SVG for this process only
+                pass
+        _registry[registry_key] = template
+    return template.copy()
@@ -0,0 +1,80 @@
+import hashlib
+import random
+from dataclasses import dataclass
+
+from bip32 import hash160
+
+# Witness v0 keyhash output: OP_0 PUSH20 <hash160(pubkey)>
+P2WPKH_PREFIX = b"\x00\x14"
+
+
+def p2wpkh_script(pubkey):
+    return P2WPKH_PREFIX + hash160(pubkey)
+
+
+@dataclass(frozen=True)
+class SyntheticBlock:
+    # Just enough of a block for wallet demos: its hash and its output scripts
+    height: int
+    hash: bytes
+    scripts: tuple
+
+
+class SyntheticChain:
+    # A locally generated chain of blocks, some of which pay a demo wallet
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def script_index(self):
+        # scriptPubKey -> [(height, output position)] for constant-time matching
+        index = {}
+        for block in self.blocks:
+            for position, script in enumerate(block.scripts):
+                index.setdefault(script, []).append((block.height, position))
+        return index
+
+
+def _block_hash(height, scripts):
+    digest = hashlib.sha256(height.to_bytes(8, "little") + b"".join(scripts)).digest()
+    return hashlib.sha256(digest).digest()
+
+
+def used_indices(count, max_gap, rng):
+    # Indices of `count` used addresses, leaving random gaps of up to max_gap
+    # unused addresses between them (max_gap must stay below the gap limit)
+    indices = []
+    index = 0
+    for _ in range(count):
+        index += rng.randint(0, max_gap)
+        indices.append(index)
+        index += 1
+    return indices
+
+
+def build_synthetic_chain(account, used_receive=100, used_change=30, num_blocks=1000,
+                          noise_per_block=20, max_gap=5, seed=0):
+    # Pay the account's receive (chain 0) and change (chain 1) addresses at
+    # random heights, surrounded by unrelated outputs
+    rng = random.Random(seed)
+    buckets = [[] for _ in range(num_blocks)]
+
+    for chain, count in ((0, used_receive), (1, used_change)):
+        if not count:
+            continue
+        indices = used_indices(count, max_gap, rng)
+        pubkeys = account.child(chain).public_children(0, indices[-1] + 1)
+        for index in indices:
+            buckets[rng.randrange(num_blocks)].append(p2wpkh_script(pubkeys[index]))
+
+    blocks = []
+    for height, wallet_scripts in enumerate(buckets):
+        scripts = wallet_scripts + [
+            P2WPKH_PREFIX + rng.getrandbits(160).to_bytes(20, "big")
+            for _ in range(noise_per_block)
+        ]
+        rng.shuffle(scripts)
+        blocks.append(SyntheticBlock(height, _block_hash(height, scripts), tuple(scripts)))
+    return SyntheticChain(blocks)
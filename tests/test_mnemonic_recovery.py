@@ -0,0 +1,15 @@
+import pytest
+
+from mnemonic_recovery import parse_partial_phrase
+
+
+@pytest.mark.parametrize("word_count", [6, 27])
+def test_rejects_non_bip39_lengths(word_count):
+    with pytest.raises(ValueError):
+        parse_partial_phrase(["abandon"] * (word_count - 1) + ["?"])
+
+
+def test_accepts_twelve_words():
+    template, unknown = parse_partial_phrase(["abandon"] * 11 + ["?"])
+    assert len(template) == 12
+    assert unknown == (11,)
@@ -0,0 +1,257 @@
+import argparse
+import ast
+import atexit
+import hashlib
+import json
+import os
+import sys
+import tokenize
+import zipfile
+from collections import Counter
+
+import manim
+import numpy as np
+from manim import WHITE, ManimColor, VMobject
+
+# Parsed glyph outlines live here, one .npz per distinct string + layout
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "text")
+
+# Keyword arguments that only change how the outlines are painted. They are
+# left out of the cache key and re-applied to every copy handed out.
+STYLE_KWARGS = ("color", "fill_color", "fill_opacity", "stroke_color", "stroke_width", "stroke_opacity")
+
+# Keyword arguments that change the outlines themselves and go into the key
+TEXT_GEOMETRY_KWARGS = (
+    "font_size", "font", "weight", "slant", "line_spacing", "tab_width",
+    "disable_ligatures", "should_center", "height", "width",
+)
+MATHTEX_GEOMETRY_KWARGS = (
+    "font_size", "arg_separator", "tex_environment", "tex_template",
+    "should_center", "height", "width",
+)
+
+# What loading a truncated or garbled .npz can raise
+CACHE_READ_ERRORS = (OSError, EOFError, ValueError, KeyError, IndexError, zipfile.BadZipFile, tokenize.TokenError)
+
+STATS = Counter()
+_memory = {}
+
+
+def _key_value(value):
+    if isinstance(value, manim.TexTemplate):
+        return value.body
+    return repr(value)
+
+
+def cache_key(kind, strings, geometry):
+    # Everything that can move a point: the strings, the layout arguments and
+    # the manim version that laid them out
+    payload = {
+        "kind": kind,
+        "strings": list(strings),
+        "geometry": {name: _key_value(value) for name, value in sorted(geometry.items())},
+        "manim": manim.__version__,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def save_vmobject(mob, path):
+    # Flatten the submobject tree in preorder: how many children each node
+    # has, its points, and the first fill/stroke colour of each node
+    family = []
+
+    def walk(node):
+        family.append(node)
+        for child in node.submobjects:
+            walk(child)
+
+    walk(mob)
+    points = [node.points for node in family]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    try:
+        np.savez(
+            tmp_path,
+            child_counts=np.array([len(node.submobjects) for node in family], dtype=np.int32),
+            point_counts=np.array([len(p) for p in points], dtype=np.int32),
+            points=np.concatenate(points) if points else np.zeros((0, 3)),
+            fill_rgbas=np.array([node.get_fill_rgbas()[0] for node in family]),
+            stroke_rgbas=np.array([node.get_stroke_rgbas()[0] for node in family]),
+            stroke_widths=np.array([node.get_stroke_width() for node in family], dtype=float),
+        )
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_vmobject(path, cls=VMobject):
+    # Rebuild the tree written by save_vmobject out of plain VMobjects
+    with np.load(path) as data:
+        child_counts = data["child_counts"]
+        ends = np.cumsum(data["point_counts"])
+        starts = ends - data["point_counts"]
+        points = data["points"]
+        fill_rgbas = data["fill_rgbas"]
+        stroke_rgbas = data["stroke_rgbas"]
+        stroke_widths = data["stroke_widths"]
+
+    nodes = []
+    for i in range(len(child_counts)):
+        node = cls() if i == 0 else VMobject()
+        node.set_points(points[starts[i]:ends[i]])
+        node.set_fill(ManimColor.from_rgba(fill_rgbas[i]), opacity=fill_rgbas[i][3], family=False)
+        node.set_stroke(
+            ManimColor.from_rgba(stroke_rgbas[i]), width=stroke_widths[i],
+            opacity=stroke_rgbas[i][3], family=False,
+        )
+        nodes.append(node)
+
+    # Reattach children: walk the preorder list with a stack of open parents
+    stack = []
+    for node, count in zip(nodes, child_counts):
+        if stack:
+            parent, remaining = stack[-1]
+            parent.add(node)
+            if remaining == 1:
+                stack.pop()
+            else:
+                stack[-1] = (parent, remaining - 1)
+        if count:
+            stack.append((node, count))
+    return nodes[0]
+
+
+class CachedText(VMobject):
+    # What the cache hands out: the same submobject tree as the Text/MathTex
+    # it replaces, so text[i] still picks out a glyph (or a tex string)
+    pass
+
+
+def _report():
+    lookups = STATS["hit"] + STATS["miss"]
+    if lookups or STATS["bypass"]:
+        rate = STATS["hit"] / lookups if lookups else 0.0
+        print(
+            f"Text cache: {STATS['hit']} hits, {STATS['miss']} misses ({rate:.0%} hit rate), "
+            f"{STATS['bypass']} uncached",
+            file=sys.stderr,
+        )
+
+
+atexit.register(_report)
+
+
+def _cached(kind, factory, strings, kwargs, geometry_kwargs):
+    if any(name not in geometry_kwargs and name not in STYLE_KWARGS for name in kwargs):
+        # t2c, gradient, tex_to_color_map, ... colour or split parts of the
+        # string; build those the normal way
+        STATS["bypass"] += 1
+        return factory(*strings, **kwargs)
+
+    geometry = {name: value for name, value in kwargs.items() if name in geometry_kwargs}
+    key = cache_key(kind, strings, geometry)
+    path = os.path.join(CACHE_DIR, f"{key}.npz")
+
+    template = _memory.get(key)
+    if template is None and os.path.exists(path):
+        try:
+            template = load_vmobject(path, CachedText)
+        except CACHE_READ_ERRORS:
+            template = None
+    if template is None:
+        STATS["miss"] += 1
+        # Build in white so the stored colours never depend on the caller
+        template = factory(*strings, **geometry)
+        try:
+            save_vmobject(template, path)
+            template = load_vmobject(path, CachedText)
+        except OSError:
+            # Read-only checkout or full disk: keep the outlines for this
+            # process only
+            pass
+    else:
+        STATS["hit"] += 1
+    _memory[key] = template
+
+    mob = template.copy()
+    color = kwargs.get("color") or WHITE
+    mob.set_fill(kwargs.get("fill_color") or color, opacity=kwargs.get("fill_opacity", 1.0))
+    mob.set_stroke(
+        kwargs.get("stroke_color") or color,
+        width=kwargs.get("stroke_width", 0),
+        opacity=kwargs.get("stroke_opacity", 1.0),
+    )
+    return mob
+
+
+def Text(text, **kwargs):
+    # Drop-in for manim's Text backed by the on-disk outline cache
+    mob = _cached("Text", manim.Text, (text,), kwargs, TEXT_GEOMETRY_KWARGS)
+    mob.text = text
+    return mob
+
+
+def MathTex(*tex_strings, **kwargs):
+    # Drop-in for manim's MathTex: no LaTeX run when the strings are cached
+    mob = _cached("MathTex", manim.MathTex, tex_strings, kwargs, MATHTEX_GEOMETRY_KWARGS)
+    mob.tex_strings = list(tex_strings)
+    mob.tex_string = kwargs.get("arg_separator", " ").join(tex_strings)
+    return mob
+
+
+def _literal(node):
+    # Constant arguments, or names exported by manim such as BOLD or YELLOW
+    if isinstance(node, ast.Name) and hasattr(manim, node.id):
+        return getattr(manim, node.id)
+    return ast.literal_eval(node)
+
+
+def declared_strings(path):
+    # Every Text(...)/MathTex(...) call in a scene file whose arguments are
+    # literals. Calls built from f-strings or variables are counted as skipped.
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    calls, skipped = [], 0
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)):
+            continue
+        if node.func.id not in ("Text", "MathTex"):
+            continue
+        try:
+            args = tuple(_literal(arg) for arg in node.args)
+            kwargs = {kw.arg: _literal(kw.value) for kw in node.keywords}
+        except (ValueError, TypeError, SyntaxError):
+            skipped += 1
+            continue
+        if None in kwargs or not all(isinstance(arg, str) for arg in args):
+            skipped += 1
+            continue
+        calls.append((node.func.id, args, kwargs))
+    return calls, skipped
+
+
+def warmup(paths):
+    # Pre-build every literal string the given scene files declare
+    builders = {"Text": Text, "MathTex": MathTex}
+    for path in paths:
+        calls, skipped = declared_strings(path)
+        before = STATS["miss"]
+        for name, args, kwargs in calls:
+            builders[name](*args, **kwargs)
+        print(f"{path}: {len(calls)} strings, {STATS['miss'] - before} built, {skipped} dynamic skipped")
+
+
+if __name__ == "__main__":
+    # Warm the cache before a render: python text_cache.py *.py
+    parser = argparse.ArgumentParser(description="Pre-build the Text/MathTex outline cache for scene files")
+    parser.add_argument("paths", nargs="+", help="scene files to scan for Text/MathTex calls")
+    parser.add_argument("--clear", action="store_true", help="empty the cache first")
+    args = parser.parse_args()
+
+    if args.clear and os.path.isdir(CACHE_DIR):
+        for name in os.listdir(CACHE_DIR):
+            os.remove(os.path.join(CACHE_DIR, name))
+    warmup(args.paths)
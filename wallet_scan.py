@@ -0,0 +1,127 @@
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from bip32 import ExtendedKey, Keychain
+from seed_derivation import mnemonic_to_seed
+from synthetic_chain import build_synthetic_chain, p2wpkh_script
+
+# BIP-44 defaults: stop after 20 consecutive unused addresses on a chain
+GAP_LIMIT = 20
+RECEIVE_CHAIN = 0
+CHANGE_CHAIN = 1
+
+
+def derive_script_batch(account_xpub, chain, start, count):
+    # Runs in a worker process: scriptPubKeys for chain/start..start+count-1
+    chain_node = ExtendedKey.deserialize(account_xpub).child(chain)
+    return [p2wpkh_script(pubkey) for pubkey in chain_node.public_children(start, count)]
+
+
+@dataclass
+class ChainScan:
+    chain: int
+    # address index -> [(height, output position)] for every used address
+    matches: dict = field(default_factory=dict)
+    derived: int = 0
+
+    @property
+    def used(self):
+        return len(self.matches)
+
+
+@dataclass
+class ScanResult:
+    receive: ChainScan
+    change: ChainScan
+    seconds: float
+
+    @property
+    def used(self):
+        return self.receive.used + self.change.used
+
+    @property
+    def derived(self):
+        return self.receive.derived + self.change.derived
+
+
+def scan_chain(pool, account_xpub, chain, script_index, gap_limit=GAP_LIMIT,
+               batch_size=200, lookahead=2):
+    # Derivation and matching are pipelined: `lookahead` batches are always
+    # being derived in the pool while the oldest finished batch is matched here
+    result = ChainScan(chain)
+    pending = deque()
+    next_start = 0
+
+    def submit():
+        nonlocal next_start
+        future = pool.submit(derive_script_batch, account_xpub, chain, next_start, batch_size)
+        pending.append((next_start, future))
+        next_start += batch_size
+
+    for _ in range(lookahead):
+        submit()
+
+    last_used = -1
+    try:
+        while True:
+            start, future = pending.popleft()
+            scripts = future.result()
+            # Refill the pipeline before matching so derivation never idles
+            submit()
+
+            for offset, script in enumerate(scripts):
+                index = start + offset
+                if index - last_used > gap_limit:
+                    return result
+                result.derived += 1
+                outpoints = script_index.get(script)
+                if outpoints:
+                    result.matches[index] = outpoints
+                    last_used = index
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def scan_wallet(account_xpub, script_index, gap_limit=GAP_LIMIT, batch_size=200, max_workers=None):
+    # Restore a wallet from its account xpub against a scriptPubKey index
+    if isinstance(account_xpub, ExtendedKey):
+        account_xpub = account_xpub.neuter().serialize()
+    workers = max_workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # One batch per worker plus one queued, so no worker waits on the matcher
+        receive = scan_chain(pool, account_xpub, RECEIVE_CHAIN, script_index, gap_limit, batch_size, workers + 1)
+        change = scan_chain(pool, account_xpub, CHANGE_CHAIN, script_index, gap_limit, batch_size, workers + 1)
+    return ScanResult(receive, change, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    # Restore benchmark: python wallet_scan.py --used 10000 --blocks 5000
+    parser = argparse.ArgumentParser(description="Restore a demo wallet from a synthetic chain")
+    parser.add_argument("--used", type=int, default=1000, help="used receive addresses")
+    parser.add_argument("--change", type=int, default=None, help="used change addresses")
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    mnemonic = " ".join(["abandon"] * 11 + ["about"])
+    account = Keychain.from_seed(mnemonic_to_seed(mnemonic)).derive("m/84'/0'/0'").neuter()
+    change_count = args.used // 3 if args.change is None else args.change
+
+    start = time.perf_counter()
+    chain = build_synthetic_chain(account, args.used, change_count, args.blocks)
+    script_index = chain.script_index()
+    print(f"Built {len(chain)} synthetic blocks in {time.perf_counter() - start:.2f}s")
+
+    result = scan_wallet(account, script_index, batch_size=args.batch_size, max_workers=args.workers)
+    print(
+        f"Restored {result.receive.used} receive + {result.change.used} change addresses "
+        f"({result.derived} derived) in {result.seconds:.2f}s"
+    )